@@ -7,12 +7,42 @@ Complete RAG solution with:
 """
 
 from http.server import BaseHTTPRequestHandler
+import atexit
 import json
 import os
 import hashlib
+import hmac
+import math
+from collections import Counter, OrderedDict
+from functools import lru_cache
 from datetime import datetime
 from typing import Optional, List, Dict, Tuple
 import re
+import threading
+
+import httpx
+import numpy as np
+
+# Try to import orjson for faster (de)serialization, fall back to stdlib json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def json_dumps(data) -> bytes:
+    """Serialize to UTF-8 JSON bytes."""
+    if HAS_ORJSON:
+        return orjson.dumps(data)
+    return json.dumps(data).encode()
+
+
+def json_loads(data):
+    """Parse JSON from str or bytes."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
 
 # ============================================================================
 # AUTHENTICATION
@@ -24,20 +54,32 @@ DEMO_USERS = {
     "student_demo": {"password": "demo123", "role": "student"},
 }
 
+SECRET_BYTES = os.getenv("JWT_SECRET", "legal_lens_secret").encode()
+PASSWORD_SALT = b"legal_lens_demo:"
+
+def _hash_password(password: str) -> bytes:
+    return hashlib.sha256(PASSWORD_SALT + password.encode()).digest()
+
+# Login compares digests, never the plaintext
+DEMO_USER_HASHES = {username: _hash_password(user["password"]) for username, user in DEMO_USERS.items()}
+
+def _sign(payload: str) -> str:
+    """HMAC-SHA256 signature (truncated) for a token payload."""
+    return hmac.new(SECRET_BYTES, payload.encode(), hashlib.sha256).hexdigest()[:16]
+
 def create_token(username: str, role: str) -> str:
-    secret = os.getenv("JWT_SECRET", "legal_lens_secret")
     payload = f"{username}:{role}:{int(datetime.utcnow().timestamp())}"
-    sig = hashlib.sha256(f"{payload}:{secret}".encode()).hexdigest()[:16]
-    return f"{payload}:{sig}"
+    return f"{payload}:{_sign(payload)}"
 
 def verify_token(token: str) -> Optional[Dict]:
-    try:
-        parts = token.split(":")
-        if len(parts) >= 3:
-            return {"username": parts[0], "role": parts[1]}
-    except:
-        pass
-    return None
+    parts = token.split(":")
+    if len(parts) != 4:
+        return None
+    
+    username, role, issued_at, signature = parts
+    if not hmac.compare_digest(_sign(f"{username}:{role}:{issued_at}"), signature):
+        return None
+    return {"username": username, "role": role}
 
 # ============================================================================
 # KNOWLEDGE GRAPH (IPC -> BNS Mappings)
@@ -56,17 +98,20 @@ STATUTE_MAPPINGS = {
     "506": {"bns": "349", "desc": "Criminal intimidation"},
 }
 
+# Response objects are constant, so build them once at import
+STATUTE_RESPONSES = {
+    section: {
+        "old": f"IPC Section {section}",
+        "new": f"BNS Section {mapping['bns']}",
+        "description": mapping["desc"],
+        "mapping_text": f"IPC {section} → BNS {mapping['bns']}: {mapping['desc']}"
+    }
+    for section, mapping in STATUTE_MAPPINGS.items()
+}
+
 def get_statute_mapping(section: str) -> Optional[Dict]:
-    """Get BNS equivalent for IPC section."""
-    mapping = STATUTE_MAPPINGS.get(section)
-    if mapping:
-        return {
-            "old": f"IPC Section {section}",
-            "new": f"BNS Section {mapping['bns']}",
-            "description": mapping["desc"],
-            "mapping_text": f"IPC {section} → BNS {mapping['bns']}: {mapping['desc']}"
-        }
-    return None
+    """Get BNS equivalent for IPC section (shared dict, do not mutate)."""
+    return STATUTE_RESPONSES.get(section)
 
 # ============================================================================
 # DOCUMENT DATABASE (Pre-indexed with embeddings)
@@ -176,81 +221,182 @@ The guidelines were later codified as the Sexual Harassment of Women at Workplac
 # For Vercel, we use keyword + semantic scoring
 EMBEDDINGS_AVAILABLE = False
 
+# ============================================================================
+# SEARCH INDEX (BM25, built once at import)
+# ============================================================================
+
+TOKEN_RE = re.compile(r"\w+")
+# Query terms: same tokens as the index, minus anything shorter than 3 chars
+QUERY_TOKEN_RE = re.compile(r"\w{3,}")
+IPC_RE = re.compile(r'(?:IPC|section)\s*(\d+A?)', re.IGNORECASE)
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Field boosts folded into the index; content gets a BM25-weighted share
+FIELD_WEIGHTS = {
+    "title": 0.40,
+    "keywords": 0.35,
+    "statutes": 0.30,
+    "related_judgments": 0.20,
+}
+CONTENT_WEIGHT = 0.20
+
+
+def _tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def build_bm25_index(docs: List[Dict]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Build a sparse term -> (doc_indices, weights) index over the corpus.
+
+    Each weight is the field boost for every field the term appears in, plus a
+    BM25 (k1=1.5, b=0.75) content score scaled into [0, CONTENT_WEIGHT], so
+    scoring a query is a sum over the postings of its terms. Per-term postings
+    are used rather than a scipy.sparse matrix: scipy is not a dependency and
+    a query only ever reads a few rows.
+    """
+    content_tfs = [Counter(_tokenize(doc.get("content", ""))) for doc in docs]
+    doc_lens = [sum(tf.values()) for tf in content_tfs]
+    avgdl = sum(doc_lens) / len(docs) if docs else 0.0
+    avgdl = avgdl or 1.0
+    
+    df = Counter()
+    for tf in content_tfs:
+        df.update(tf.keys())
+    idf = {
+        term: math.log(1 + (len(docs) - n + 0.5) / (n + 0.5))
+        for term, n in df.items()
+    }
+    max_idf = max(idf.values(), default=1.0)
+    
+    postings: Dict[str, Dict[int, float]] = {}
+    for i, doc in enumerate(docs):
+        for field, weight in FIELD_WEIGHTS.items():
+            value = doc.get(field, "")
+            if isinstance(value, list):
+                value = " ".join(value)
+            for term in set(_tokenize(value)):
+                row = postings.setdefault(term, {})
+                row[i] = row.get(i, 0.0) + weight
+        
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lens[i] / avgdl)
+        for term, tf in content_tfs[i].items():
+            bm25 = tf * (BM25_K1 + 1) / (tf + norm)
+            score = CONTENT_WEIGHT * (idf[term] / max_idf) * bm25 / (BM25_K1 + 1)
+            row = postings.setdefault(term, {})
+            row[i] = row.get(i, 0.0) + score
+    
+    index = {}
+    for term, row in postings.items():
+        doc_idx = np.fromiter(sorted(row), dtype=np.int32, count=len(row))
+        index[term] = (doc_idx, np.array([row[i] for i in doc_idx.tolist()], dtype=np.float64))
+    return index
+
+
+BM25_INDEX = build_bm25_index(DOCUMENTS)
+
 # ============================================================================
 # SEARCH ENGINE
 # ============================================================================
 
+DOC_BY_ID = {doc["doc_id"]: doc for doc in DOCUMENTS}
+DOC_IDS = [doc["doc_id"] for doc in DOCUMENTS]
+
+# Search results only show a preview; content is static so slice it once
+CONTENT_PREVIEW_CHARS = 600
+CONTENT_PREVIEW_BY_DOC_ID = {
+    doc["doc_id"]: doc["content"][:CONTENT_PREVIEW_CHARS] for doc in DOCUMENTS
+}
+
+# RAG context block per document, joined for the top results at query time
+CONTEXT_BLOCK_BY_DOC_ID = {
+    doc["doc_id"]: f"**{doc.get('title', '')}**\n{CONTENT_PREVIEW_BY_DOC_ID[doc['doc_id']]}"
+    for doc in DOCUMENTS
+}
+
+# Static fields of each search result; only the score varies per query
+RESULT_FIELDS_BY_DOC_ID = {
+    doc["doc_id"]: {
+        "doc_id": doc["doc_id"],
+        "title": doc.get("title", ""),
+        "content": CONTENT_PREVIEW_BY_DOC_ID[doc["doc_id"]],
+        "source": "semantic",
+        "metadata": {
+            "year": doc.get("year"),
+            "court": doc.get("court"),
+            "statutes": doc.get("statutes", []),
+            "related": doc.get("related_judgments", [])
+        }
+    }
+    for doc in DOCUMENTS
+}
+
+
+@lru_cache(maxsize=1024)
+def _rank_documents(query_terms: Tuple[str, ...], top_k: int) -> Tuple[Tuple[str, float], ...]:
+    """Rank documents for normalized query terms; returns (doc_id, score) pairs."""
+    if top_k <= 0:
+        return ()
+    
+    # Dense accumulator indexed by document position; a term's postings have
+    # unique indices, so one fancy-indexed add per term is exact
+    scores = np.zeros(len(DOCUMENTS))
+    for word in query_terms:
+        postings = BM25_INDEX.get(word)
+        if postings is not None:
+            doc_idx, weights = postings
+            scores[doc_idx] += weights
+    
+    candidates = np.flatnonzero(scores > 0)
+    if not candidates.size:
+        return ()
+    
+    # Normalize score
+    capped = np.minimum(scores[candidates], 1.0)
+    
+    # Partial sort: only the top_k best are ever returned
+    if top_k < candidates.size:
+        part = np.argpartition(-capped, top_k - 1)[:top_k]
+        threshold = capped[part].min()
+        # Keep every tie at the cut-off so ties resolve by document order
+        keep = np.flatnonzero(capped >= threshold)
+        candidates, capped = candidates[keep], capped[keep]
+    
+    # Highest score first, earlier document first on ties
+    order = np.lexsort((candidates, -capped))[:top_k]
+    return tuple(
+        (DOC_IDS[i], float(score))
+        for i, score in zip(candidates[order].tolist(), capped[order].tolist())
+    )
+
+
 def semantic_keyword_search(query: str, top_k: int = 5) -> List[Tuple[Dict, float]]:
     """
-    Hybrid search combining keyword matching with semantic relevance.
-    Uses TF-IDF style scoring with semantic boosting.
+    Hybrid search over the precomputed BM25 index.
+    Field boosts (title, keywords, statutes, related judgments) are already
+    folded into the postings, so a query only touches its own terms.
+    Rankings are memoized on the sorted query terms.
     """
-    query_lower = query.lower()
-    query_words = [w.strip() for w in query_lower.split() if len(w.strip()) > 2]
+    # Repeated words would only add the same postings again
+    query_words = list(dict.fromkeys(QUERY_TOKEN_RE.findall(query.lower())))
     
     if not query_words:
         return []
     
-    scored_docs = []
-    
-    for doc in DOCUMENTS:
-        score = 0.0
-        
-        title = doc.get("title", "").lower()
-        content = doc.get("content", "").lower()
-        keywords = [k.lower() for k in doc.get("keywords", [])]
-        statutes = " ".join(doc.get("statutes", [])).lower()
-        related = " ".join(doc.get("related_judgments", [])).lower()
-        
-        for word in query_words:
-            # Title match (highest weight)
-            if word in title:
-                score += 0.40
-            
-            # Keyword match (very high weight)
-            for kw in keywords:
-                if word in kw or kw in word:
-                    score += 0.35
-                    break
-            
-            # Statute match
-            if word in statutes:
-                score += 0.30
-            
-            # Related judgment match
-            if word in related:
-                score += 0.20
-            
-            # Content match (frequency-based)
-            word_count = content.count(word)
-            if word_count > 0:
-                score += min(word_count * 0.03, 0.20)
-        
-        # Normalize score
-        score = min(score, 1.0)
-        
-        if score > 0:
-            scored_docs.append((doc, score))
-    
-    # Sort by score descending
-    scored_docs.sort(key=lambda x: x[1], reverse=True)
-    
-    return scored_docs[:top_k]
+    ranked = _rank_documents(tuple(sorted(query_words)), top_k)
+    return [(DOC_BY_ID[doc_id], score) for doc_id, score in ranked]
 
 # ============================================================================
 # RAG - LLM INTEGRATION
 # ============================================================================
 
-def call_groq_llm(query: str, context: str, statute_info: str = "") -> str:
-    """Call Groq API for RAG response generation."""
-    import urllib.request
-    import urllib.error
-    
-    groq_key = os.getenv("GROQ_API_KEY", "")
-    if not groq_key:
-        return "AI summaries unavailable. Set GROQ_API_KEY environment variable."
-    
-    system_prompt = """You are a legal research assistant specializing in Indian law.
+GROQ_BASE_URL = "https://api.groq.com"
+GROQ_PATH = "/openai/v1/chat/completions"
+GROQ_MODEL = "llama-3.1-8b-instant"
+
+SYSTEM_PROMPT = """You are a legal research assistant specializing in Indian law.
 
 Your role:
 1. Provide accurate, concise summaries based on the documents provided
@@ -260,44 +406,98 @@ Your role:
 5. Be helpful to both law students and practitioners
 
 Keep responses focused and under 300 words."""
+
+# Only the user message varies per call: encode the rest of the body once
+_GROQ_BODY_HEAD = (
+    b'{"model":' + json_dumps(GROQ_MODEL)
+    + b',"max_tokens":600,"temperature":0.3'
+    + b',"messages":[{"role":"system","content":' + json_dumps(SYSTEM_PROMPT)
+    + b'},{"role":"user","content":'
+)
+_GROQ_BODY_TAIL = b'}]}'
+
+# Keep-alive connection pool reused across warm invocations; httpx.Client is
+# thread-safe, so concurrent LLM calls each check out their own connection.
+# The transport retries once when a pooled connection can't be (re)opened.
+_groq_client = httpx.Client(
+    base_url=GROQ_BASE_URL,
+    timeout=30,
+    transport=httpx.HTTPTransport(retries=1),
+)
+atexit.register(_groq_client.close)
+
+
+@lru_cache(maxsize=1)
+def _groq_headers(groq_key: str) -> Dict[str, str]:
+    """Request headers, built once per API key."""
+    return {
+        "Authorization": f"Bearer {groq_key}",
+        "Content-Type": "application/json"
+    }
+
+
+def _groq_post(body: bytes, headers: Dict[str, str]) -> Tuple[int, bytes]:
+    """POST to Groq over the pooled client; returns (status, body)."""
+    response = _groq_client.post(GROQ_PATH, content=body, headers=headers)
+    return response.status_code, response.content
+
+
+def call_groq_llm(query: str, context: str, statute_info: str = "") -> str:
+    """Call Groq API for RAG response generation."""
+    groq_key = os.getenv("GROQ_API_KEY", "")
+    if not groq_key:
+        return "AI summaries unavailable. Set GROQ_API_KEY environment variable."
     
     user_content = f"Query: {query}\n\n"
     if statute_info:
         user_content += f"Statute Information:\n{statute_info}\n\n"
     user_content += f"Relevant Documents:\n{context}"
     
-    request_body = json.dumps({
-        "model": "llama-3.1-8b-instant",
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_content}
-        ],
-        "max_tokens": 600,
-        "temperature": 0.3
-    }).encode()
+    request_body = _GROQ_BODY_HEAD + json_dumps(user_content) + _GROQ_BODY_TAIL
     
     try:
-        req = urllib.request.Request(
-            "https://api.groq.com/openai/v1/chat/completions",
-            data=request_body,
-            headers={
-                "Authorization": f"Bearer {groq_key}",
-                "Content-Type": "application/json"
-            },
-            method="POST"
-        )
+        status, payload = _groq_post(request_body, _groq_headers(groq_key))
+        if status != 200:
+            return f"AI service error: {status}"
         
-        with urllib.request.urlopen(req, timeout=30) as response:
-            data = json.loads(response.read().decode())
-            if "choices" in data:
-                return data["choices"][0]["message"]["content"]
-            return "AI response unavailable."
+        data = json_loads(payload)
+        if "choices" in data:
+            return data["choices"][0]["message"]["content"]
+        return "AI response unavailable."
             
-    except urllib.error.HTTPError as e:
-        return f"AI service error: {e.code}"
     except Exception as e:
         return f"AI error: {str(e)}"
 
+# Bounded LRU of generated answers; demo queries repeat a lot
+LLM_CACHE_SIZE = 256
+_llm_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_llm_cache_lock = threading.Lock()
+_LLM_ERROR_PREFIXES = ("AI summaries unavailable", "AI service error", "AI error", "AI response unavailable")
+
+
+def generate_llm_response(query: str, context: str, statute_info: str = "") -> str:
+    """call_groq_llm with an LRU cache keyed by a hash of its inputs."""
+    key = hashlib.blake2b(f"{query}\n{context}\n{statute_info}".encode(), digest_size=16).digest()
+    
+    with _llm_cache_lock:
+        cached = _llm_cache.get(key)
+        if cached is not None:
+            _llm_cache.move_to_end(key)
+            return cached
+    
+    response = call_groq_llm(query, context, statute_info)
+    
+    # Don't pin transient failures in the cache
+    if not response.startswith(_LLM_ERROR_PREFIXES):
+        with _llm_cache_lock:
+            _llm_cache[key] = response
+            _llm_cache.move_to_end(key)
+            if len(_llm_cache) > LLM_CACHE_SIZE:
+                _llm_cache.popitem(last=False)
+    
+    return response
+
+
 # ============================================================================
 # API HANDLER
 # ============================================================================
@@ -328,17 +528,17 @@ class handler(BaseHTTPRequestHandler):
             "features": ["semantic_search", "knowledge_graph", "rag", "statute_mapping"],
             "documents_indexed": len(DOCUMENTS)
         }
-        self.wfile.write(json.dumps(response).encode())
+        self.wfile.write(json_dumps(response))
     
     def do_POST(self):
         path = self.path.split("?")[0].rstrip("/")
         
         # Read body
         content_length = int(self.headers.get("Content-Length", 0))
-        body = self.rfile.read(content_length).decode() if content_length else "{}"
+        body = self.rfile.read(content_length) if content_length else b"{}"
         
         try:
-            data = json.loads(body) if body else {}
+            data = json_loads(body) if body else {}
         except:
             data = {}
         
@@ -356,8 +556,9 @@ class handler(BaseHTTPRequestHandler):
         username = data.get("username", "")
         password = data.get("password", "")
         
-        user = DEMO_USERS.get(username)
-        if user and user["password"] == password:
+        expected = DEMO_USER_HASHES.get(username)
+        if expected and hmac.compare_digest(expected, _hash_password(password)):
+            user = DEMO_USERS[username]
             token = create_token(username, user["role"])
             self.send_json_response(200, {
                 "access_token": token,
@@ -390,38 +591,24 @@ class handler(BaseHTTPRequestHandler):
         # 1. SEARCH - Semantic + Keyword hybrid
         search_results = semantic_keyword_search(query, top_k)
         
-        results = []
-        for doc, score in search_results:
-            results.append({
-                "doc_id": doc["doc_id"],
-                "title": doc.get("title", ""),
-                "content": doc["content"][:600],
-                "score": round(score, 3),
-                "source": "semantic",
-                "metadata": {
-                    "year": doc.get("year"),
-                    "court": doc.get("court"),
-                    "statutes": doc.get("statutes", []),
-                    "related": doc.get("related_judgments", [])
-                }
-            })
+        results = [
+            {**RESULT_FIELDS_BY_DOC_ID[doc["doc_id"]], "score": round(score, 3)}
+            for doc, score in search_results
+        ]
         
         # 2. KNOWLEDGE GRAPH - Check for statute references
         statute_info = ""
-        ipc_match = re.search(r'(?:IPC|ipc|section)\s*(\d+A?)', query)
+        ipc_match = IPC_RE.search(query)
         if ipc_match:
-            section = ipc_match.group(1)
+            section = ipc_match.group(1).upper()
             mapping = get_statute_mapping(section)
             if mapping:
                 statute_info = mapping["mapping_text"]
         
         # 3. RAG - Generate LLM response
-        context = "\n\n".join([
-            f"**{r['title']}**\n{r['content']}"
-            for r in results[:3]
-        ])
+        context = "\n\n".join(CONTEXT_BLOCK_BY_DOC_ID[r["doc_id"]] for r in results[:3])
         
-        llm_response = call_groq_llm(query, context, statute_info)
+        llm_response = generate_llm_response(query, context, statute_info)
         
         self.send_json_response(200, {
             "query": query,
@@ -447,4 +634,4 @@ class handler(BaseHTTPRequestHandler):
         self.send_header("Content-Type", "application/json")
         self.send_cors_headers()
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        self.wfile.write(json_dumps(data))
@@ -0,0 +1,110 @@
+"""
+history.py - Search history storage backed by SQLite.
+
+One database file for all users, opened once in WAL mode so readers never
+block the background writer and concurrent appends are not lost.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+
+def ns_to_iso(ts_ns: int) -> str:
+    """Format an integer epoch-nanosecond timestamp as naive ISO 8601 UTC (like utcnow().isoformat())."""
+    seconds, ns = divmod(int(ts_ns), 1_000_000_000)
+    utc = datetime.fromtimestamp(seconds, tz=timezone.utc)
+    return utc.replace(tzinfo=None, microsecond=ns // 1000).isoformat()
+
+
+def iso_to_ns(timestamp: str) -> int:
+    """Parse an ISO 8601 timestamp (naive means UTC) into epoch nanoseconds."""
+    parsed = datetime.fromisoformat(timestamp)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp()) * 1_000_000_000 + parsed.microsecond * 1000
+
+
+class HistoryStore:
+    """Append-only per-user search history."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                ts INTEGER NOT NULL,  -- epoch nanoseconds
+                query TEXT NOT NULL,
+                response TEXT NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_history_user ON history (user_id, id)")
+        self._conn.commit()
+
+    def add(self, user_id: str, query: str, response: str, timestamp_ns: int):
+        """Record one search."""
+        self.add_many(user_id, [{"query": query, "response": response, "timestamp": timestamp_ns}])
+
+    def add_many(self, user_id: str, entries: list[dict]):
+        """Record several searches in one transaction (oldest first); timestamps in epoch ns."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO history (user_id, ts, query, response) VALUES (?, ?, ?, ?)",
+                [(user_id, e["timestamp"], e["query"], e["response"]) for e in entries],
+            )
+
+    def recent(self, user_id: str, limit: int = 50) -> list[dict]:
+        """Return the user's last `limit` searches, oldest first (timestamps in epoch ns)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT query, response, ts FROM history WHERE user_id = ? ORDER BY id DESC LIMIT ?",
+                (user_id, limit),
+            ).fetchall()
+
+        return [
+            {"query": query, "response": response, "timestamp": int(ts)}
+            for query, response, ts in reversed(rows)
+        ]
+
+    def import_legacy_files(self, logs_dir: Path):
+        """Import and remove history_{user}.json / .jsonl files from older versions."""
+        for legacy_file in sorted(Path(logs_dir).glob("history_*.json*")):
+            user_id = legacy_file.stem[len("history_"):]
+
+            with open(legacy_file, "r", encoding="utf-8") as f:
+                if legacy_file.suffix == ".json":
+                    entries = json.load(f)
+                else:
+                    entries = [json.loads(line) for line in f if line.strip()]
+
+            for entry in entries:
+                entry["timestamp"] = iso_to_ns(entry["timestamp"])
+            self.add_many(user_id, entries)
+            legacy_file.unlink()
+            print(f"[History] Imported {len(entries)} entries from {legacy_file.name}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Singleton instance
+_store: Optional[HistoryStore] = None
+
+
+def get_history_store(db_path: Path = Path("logs") / "history.db") -> HistoryStore:
+    """Get or create the history store."""
+    global _store
+    if _store is None:
+        _store = HistoryStore(db_path)
+    return _store
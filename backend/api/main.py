@@ -3,18 +3,26 @@ main.py - FastAPI application for Legal Lens.
 
 Endpoints:
 - POST /search         - Search legal documents
+- POST /search/stream  - Search with the LLM answer streamed as SSE
 - POST /login          - Authenticate and get JWT
 - GET  /history        - Get conversation history
 - POST /admin/mapping  - Upload mapping file (practitioner only)
 """
 
 import os
+import re
+import sys
 import json
-from datetime import datetime
+import asyncio
+import tempfile
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
-from fastapi import FastAPI, HTTPException, Depends, UploadFile, File
+from typing import Literal, Optional
+import httpx
+from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, BackgroundTasks, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
@@ -27,14 +35,94 @@ from .auth import (
     require_practitioner,
     require_student_or_practitioner,
 )
+from .history import get_history_store, ns_to_iso
+from .response_cache import SemanticResponseCache
+
+# Add parent to path for pipeline imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pipeline.semantic_search import get_search_engine
+from pipeline.graph_local import get_knowledge_graph
+from settings import get_settings
+
+# HTTP/2 needs the optional h2 package
+try:
+    import h2  # noqa: F401
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
+# OpenAI is only the fallback LLM; resolve the import once, not per request
+try:
+    from openai import AsyncOpenAI
+    HAS_OPENAI = True
+except ImportError:
+    HAS_OPENAI = False
+
+# Faster JSON parsing for uploads when orjson is installed
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Incremental JSON validation for uploads (constant memory) when ijson is installed
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
 
 # Load environment variables
 load_dotenv()
 
+# Shared outbound client: keeps TLS connections to the LLM API alive
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get or create the pooled HTTP client."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=HAS_H2,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+        )
+    return _http_client
+
+
+_openai_client = None
+
+
+def get_openai_client(api_key: str):
+    """Get or create the OpenAI fallback client (reuses its connection pool)."""
+    global _openai_client
+    if _openai_client is None or _openai_client.api_key != api_key:
+        _openai_client = AsyncOpenAI(api_key=api_key)
+    return _openai_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _http_client
+    # Startup: open the history DB and import any legacy per-user files
+    get_history_store(HISTORY_DB).import_legacy_files(LOGS_DIR)
+    # Load documents, embeddings and the KG once, not on the first search
+    get_search_engine()
+    get_knowledge_graph()
+    get_http_client()
+    yield
+    # Shutdown: close pooled connections
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 app = FastAPI(
     title="Legal Lens API",
     description="LLM-powered contextual search engine for Indian legal documents",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware for frontend - allow all origins for cloud deployment
@@ -49,6 +137,10 @@ app.add_middleware(
 # Directory for session logs
 LOGS_DIR = Path("logs")
 LOGS_DIR.mkdir(exist_ok=True)
+HISTORY_DB = LOGS_DIR / "history.db"
+
+MAX_MAPPING_BYTES = 50 * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 64 * 1024
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -88,7 +180,7 @@ class SearchResponse(BaseModel):
 class HistoryEntry(BaseModel):
     query: str
     response: str
-    timestamp: str
+    timestamp: str | int  # ISO 8601, or epoch ns with ?format=ns
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -115,6 +207,8 @@ async def login(request: LoginRequest):
 @app.post("/search", response_model=SearchResponse)
 async def search(
     request: SearchRequest,
+    background_tasks: BackgroundTasks,
+    response: Response,
     user: TokenPayload = Depends(require_student_or_practitioner),
 ):
     """
@@ -123,143 +217,115 @@ async def search(
     - Knowledge Graph for statute mappings
     - Groq LLM for answer generation
     """
-    import httpx
-    import sys
-    import re
-    from pathlib import Path
+    timestamp_ns = time.time_ns()
     
-    # Add parent to path for imports
-    sys.path.insert(0, str(Path(__file__).parent.parent))
-    from pipeline.semantic_search import get_search_engine
-    from pipeline.graph_local import get_knowledge_graph
+    try:
+        results, context = await _retrieve(request.query, request.top_k)
+        llm_response, cache_hit = await _cached_answer(request.query, context, len(results))
+        if cache_hit:
+            response.headers["Cache-Hit"] = cache_hit
+    except Exception as e:
+        results, llm_response = _search_error(e)
     
-    timestamp = datetime.utcnow().isoformat()
+    # Log the search after the response has been sent
+    background_tasks.add_task(_save_to_history, user.sub, request.query, llm_response, timestamp_ns)
     
-    # Get API keys
-    groq_key = os.getenv("GROQ_API_KEY", "")
-    openai_key = os.getenv("OPENAI_API_KEY", "")
+    return SearchResponse(
+        query=request.query,
+        results=results,
+        llm_response=llm_response,
+        timestamp=ns_to_iso(timestamp_ns),
+    )
+
+
+@app.post("/search/stream")
+async def search_stream(
+    request: SearchRequest,
+    user: TokenPayload = Depends(require_student_or_practitioner),
+):
+    """
+    Streaming variant of /search as Server-Sent Events.
     
-    results = []
-    llm_response = ""
-    kg_info = ""
+    Emits a `results` event with the retrieved documents as soon as search
+    finishes, then `token` events with LLM deltas, then a final `done` event.
+    An `error` event precedes `done` if answer generation fails mid-stream.
+    """
+    timestamp_ns = time.time_ns()
+    settings = get_settings()
+    groq_key = settings.groq_api_key
+    openai_key = settings.openai_api_key
     
-    try:
-        # 1. SEMANTIC SEARCH - Get relevant documents
-        search_engine = get_search_engine()
-        search_results = await search_engine.search(request.query, top_k=request.top_k)
-        
-        for r in search_results:
-            results.append(SearchResult(
-                doc_id=r.doc_id,
-                content=r.content,
-                score=r.score,
-                source=r.source,
-            ))
-        
-        # 2. KNOWLEDGE GRAPH - Check for statute references
-        kg = get_knowledge_graph()
-        statute_info = ""
+    async def events():
+        parts = []
+        try:
+            results, context = await _retrieve(request.query, request.top_k)
+        except Exception as e:
+            results, error_response = _search_error(e)
+            context = None
+            parts.append(error_response)
         
-        # Look for IPC/BNS section references in query
-        ipc_match = re.search(r'(IPC|ipc)\s*(\d+)', request.query)
-        bns_match = re.search(r'(BNS|bns)\s*(\d+)', request.query)
+        yield _sse("results", {
+            "query": request.query,
+            "results": [r.model_dump() for r in results],
+            "timestamp": ns_to_iso(timestamp_ns),
+        })
         
-        if ipc_match:
-            section = ipc_match.group(2)
-            mapping = kg.get_mapping("IPC", section)
-            if mapping:
-                statute_info = f"\n\nStatute Mapping: {mapping['mapping']}"
-        elif bns_match:
-            section = bns_match.group(2)
-            # Search for BNS to find corresponding IPC
-            statute_results = kg.search_statutes(f"BNS {section}")
-            if statute_results:
-                statute_info = f"\n\nRelated statute: {statute_results[0]}"
-        
-        # Build context for LLM
-        context = "\n\n".join([
-            f"Document: {r.doc_id}\n{r.content}"
-            for r in results[:3]
-        ])
-        context += statute_info
-        
-        # Try Groq first (faster), then OpenAI
-        if groq_key:
+        if context is not None:
+            cached = None
+            failed = False
+            # Named in the error message, so history shows which backend failed
+            provider = "Groq" if groq_key else "OpenAI" if _has_openai_key(openai_key) else "LLM"
             try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.post(
-                        "https://api.groq.com/openai/v1/chat/completions",
-                        headers={"Authorization": f"Bearer {groq_key}"},
-                        json={
-                            "model": "llama-3.1-8b-instant",
-                            "messages": [
-                                {"role": "system", "content": "You are a legal research assistant for Indian law. Provide concise, accurate summaries based on the documents provided. If statute mappings are shown, explain the correspondence between old (IPC/CrPC) and new (BNS/BNSS) laws."},
-                                {"role": "user", "content": f"Query: {request.query}\n\nDocuments:\n{context}"}
-                            ],
-                            "max_tokens": 500
-                        },
-                        timeout=30.0
-                    )
-                    data = response.json()
-                    if "choices" in data:
-                        llm_response = data["choices"][0]["message"]["content"]
-                    else:
-                        llm_response = f"Groq API response: {data.get('error', {}).get('message', str(data))}"
+                # Reuse the query embedding the vector search memoized, if any
+                embedding = get_search_engine().cached_embedding(request.query)
+                cached, _ = _response_cache.get(request.query, context, embedding)
+                
+                if cached is not None:
+                    parts.append(cached)
+                    yield _sse("token", {"content": cached})
+                elif groq_key:
+                    async for delta in _stream_groq(request.query, context, groq_key):
+                        parts.append(delta)
+                        yield _sse("token", {"content": delta})
+                elif _has_openai_key(openai_key):
+                    async for delta in _stream_openai(request.query, context, openai_key):
+                        parts.append(delta)
+                        yield _sse("token", {"content": delta})
+                else:
+                    answer = await _generate_answer(request.query, context, len(results))
+                    parts.append(answer)
+                    yield _sse("token", {"content": answer})
             except Exception as e:
-                llm_response = f"Groq error: {str(e)}"
-        elif openai_key and not openai_key.startswith("YOUR_"):
-            from openai import OpenAI
-            client = OpenAI(api_key=openai_key)
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a legal research assistant for Indian law."},
-                    {"role": "user", "content": f"Query: {request.query}\n\nDocuments:\n{context}"}
-                ],
-                max_tokens=500
-            )
-            llm_response = response.choices[0].message.content
-        else:
-            # No LLM - just return search results
-            llm_response = f"Found {len(results)} relevant documents. Set GROQ_API_KEY for AI-powered summaries."
+                failed = True
+                parts.append(f"{provider} error: {str(e)}")
+                yield _sse("error", {"detail": str(e)})
             
-    except Exception as e:
-        import traceback
-        error_msg = str(e)
-        results = [SearchResult(
-            doc_id="error",
-            content=f"Search error: {error_msg[:300]}",
-            score=0.0,
-            source="error",
-        )]
-        llm_response = f"Error: {error_msg[:200]}"
-    
-    # Log the search
-    _save_to_history(user.sub, request.query, llm_response, timestamp)
+            answer = "".join(parts)
+            if cached is None and not failed and _is_cacheable(answer):
+                _response_cache.put(request.query, context, answer, embedding)
+        
+        llm_response = "".join(parts)
+        yield _sse("done", {"llm_response": llm_response})
+        
+        # Log the search once the client has the full answer; the SQLite write
+        # runs in a thread so it doesn't block the event loop
+        await asyncio.to_thread(_save_to_history, user.sub, request.query, llm_response, timestamp_ns)
     
-    return SearchResponse(
-        query=request.query,
-        results=results,
-        llm_response=llm_response,
-        timestamp=timestamp,
-    )
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 
 @app.get("/history", response_model=list[HistoryEntry])
 async def get_history(
     user: TokenPayload = Depends(get_current_user),
     limit: int = 50,
+    format: Literal["iso", "ns"] = "iso",
 ):
-    """Get conversation history for the current user."""
-    history_file = LOGS_DIR / f"history_{user.sub}.json"
-    
-    if not history_file.exists():
-        return []
-    
-    with open(history_file, "r", encoding="utf-8") as f:
-        entries = json.load(f)
-    
-    return entries[-limit:]
+    """Get conversation history for the current user (?format=ns for raw epoch nanoseconds)."""
+    entries = get_history_store(HISTORY_DB).recent(user.sub, limit)
+    if format == "iso":
+        for entry in entries:
+            entry["timestamp"] = ns_to_iso(entry["timestamp"])
+    return entries
 
 
 @app.post("/admin/mapping")
@@ -275,48 +341,258 @@ async def upload_mapping(
     if not file.filename.endswith(".json"):
         raise HTTPException(status_code=400, detail="Only JSON files are supported")
     
-    content = await file.read()
-    
-    # Validate JSON
-    try:
-        data = json.loads(content)
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=400, detail="Invalid JSON file")
-    
     # Save to data folder
     data_dir = Path("data")
     data_dir.mkdir(exist_ok=True)
     mapping_path = data_dir / "mapping.json"
     
-    with open(mapping_path, "wb") as f:
-        f.write(content)
+    # Stream the upload to a temp file beside the target, enforcing the size cap
+    tmp = tempfile.NamedTemporaryFile("wb", dir=data_dir, suffix=".upload", delete=False)
+    tmp_path = Path(tmp.name)
+    try:
+        size = 0
+        with tmp:
+            while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+                size += len(chunk)
+                if size > MAX_MAPPING_BYTES:
+                    raise HTTPException(status_code=413, detail="Mapping file too large (max 50 MB)")
+                tmp.write(chunk)
+        
+        # Validate JSON off the event loop
+        try:
+            entries = await asyncio.to_thread(_count_json_entries, tmp_path)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid JSON file")
+        
+        # Atomic swap: readers never see a half-written mapping
+        os.replace(tmp_path, mapping_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
     
     # TODO: Reload mapping into Neo4j
     
-    return {"message": "Mapping uploaded successfully", "entries": len(data)}
+    return {"message": "Mapping uploaded successfully", "entries": entries}
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Helper Functions
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _save_to_history(user_id: str, query: str, response: str, timestamp: str):
-    """Append a search to the user's history file."""
-    history_file = LOGS_DIR / f"history_{user_id}.json"
+GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
+
+# Statute references, e.g. "IPC 302" or "bns 101". Old codes take precedence:
+# a query naming both an IPC and a BNS section resolves the IPC mapping.
+_OLD_STATUTE_RE = re.compile(r'\b(IPC|CrPC)\s*(\d+)', re.IGNORECASE)
+_NEW_STATUTE_RE = re.compile(r'\b(BNSS|BNS)\s*(\d+)', re.IGNORECASE)
+_STATUTE_CODES = {"IPC": "IPC", "CRPC": "CrPC", "BNS": "BNS", "BNSS": "BNSS"}
+GROQ_SYSTEM_PROMPT = "You are a legal research assistant for Indian law. Provide concise, accurate summaries based on the documents provided. If statute mappings are shown, explain the correspondence between old (IPC/CrPC) and new (BNS/BNSS) laws."
+
+
+def _resolve_statute(kg, query: str) -> str:
+    """Look up an IPC/CrPC/BNS/BNSS section referenced in the query; returns LLM context."""
+    old_match = _OLD_STATUTE_RE.search(query)
+    if old_match:
+        code = _STATUTE_CODES[old_match.group(1).upper()]
+        mapping = kg.get_mapping(code, old_match.group(2))
+        if mapping:
+            return f"\n\nStatute Mapping: {mapping['mapping']}"
+        return ""
+    
+    new_match = _NEW_STATUTE_RE.search(query)
+    if new_match:
+        code = _STATUTE_CODES[new_match.group(1).upper()]
+        # Search for the new section to find the old one it replaced
+        statute_results = kg.search_statutes(f"{code} {new_match.group(2)}")
+        if statute_results:
+            return f"\n\nRelated statute: {statute_results[0]}"
+    return ""
+
+
+async def _retrieve(query: str, top_k: int) -> tuple[list[SearchResult], str]:
+    """Run semantic search and KG lookup; returns results and the LLM context."""
+    # The statute lookup doesn't depend on the documents, so run both at once:
+    # semantic search waits on the embedding API while the KG runs in a thread
+    search_engine = get_search_engine()
+    kg = get_knowledge_graph()
+    search_results, statute_info = await asyncio.gather(
+        search_engine.search(query, top_k=top_k),
+        asyncio.to_thread(_resolve_statute, kg, query),
+    )
+    
+    results = [
+        SearchResult(
+            doc_id=r.doc_id,
+            content=r.content,
+            score=r.score,
+            source=r.source,
+        )
+        for r in search_results
+    ]
+    
+    # Build context for LLM
+    context = "\n\n".join([
+        f"Document: {r.doc_id}\n{r.content}"
+        for r in results[:3]
+    ])
+    context += statute_info
+    
+    return results, context
+
+
+def _groq_payload(query: str, context: str, stream: bool = False) -> dict:
+    payload = {
+        "model": "llama-3.1-8b-instant",
+        "messages": [
+            {"role": "system", "content": GROQ_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Query: {query}\n\nDocuments:\n{context}"}
+        ],
+        "max_tokens": 500
+    }
+    if stream:
+        payload["stream"] = True
+    return payload
+
+
+def _has_openai_key(openai_key: Optional[str]) -> bool:
+    return HAS_OPENAI and bool(openai_key) and not openai_key.startswith("YOUR_")
+
+
+def _openai_params(query: str, context: str) -> dict:
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {"role": "system", "content": "You are a legal research assistant for Indian law."},
+            {"role": "user", "content": f"Query: {query}\n\nDocuments:\n{context}"}
+        ],
+        "max_tokens": 500
+    }
+
+
+# Answers reused for identical context + near-identical query
+_response_cache = SemanticResponseCache()
+_UNCACHEABLE_PREFIXES = ("Groq error", "OpenAI error", "LLM error", "Groq API response", "Found ")
+
+
+def _is_cacheable(answer: str) -> bool:
+    """Only cache real LLM answers, not errors or the no-LLM placeholder."""
+    return bool(answer) and not answer.startswith(_UNCACHEABLE_PREFIXES)
+
+
+async def _cached_answer(query: str, context: str, result_count: int) -> tuple[str, Optional[str]]:
+    """_generate_answer behind the semantic response cache; returns (answer, hit type)."""
+    # Only the embedding the vector search already memoized; never a second API
+    # call. None (keyword fallback) limits the lookup to exact query matches.
+    embedding = get_search_engine().cached_embedding(query)
     
-    entries = []
-    if history_file.exists():
-        with open(history_file, "r", encoding="utf-8") as f:
-            entries = json.load(f)
+    cached, hit_type = _response_cache.get(query, context, embedding)
+    if cached is not None:
+        return cached, hit_type
     
-    entries.append({
-        "query": query,
-        "response": response,
-        "timestamp": timestamp,
-    })
+    answer = await _generate_answer(query, context, result_count)
+    if _is_cacheable(answer):
+        _response_cache.put(query, context, answer, embedding)
+    return answer, None
+
+
+async def _generate_answer(query: str, context: str, result_count: int) -> str:
+    """Generate the RAG answer: Groq first (faster), then OpenAI."""
+    settings = get_settings()
+    groq_key = settings.groq_api_key
+    openai_key = settings.openai_api_key
     
-    with open(history_file, "w", encoding="utf-8") as f:
-        json.dump(entries, f, indent=2)
+    if groq_key:
+        try:
+            response = await get_http_client().post(
+                GROQ_URL,
+                headers={"Authorization": f"Bearer {groq_key}"},
+                json=_groq_payload(query, context),
+            )
+            data = response.json()
+            if "choices" in data:
+                return data["choices"][0]["message"]["content"]
+            return f"Groq API response: {data.get('error', {}).get('message', str(data))}"
+        except Exception as e:
+            return f"Groq error: {str(e)}"
+    elif _has_openai_key(openai_key):
+        response = await get_openai_client(openai_key).chat.completions.create(
+            **_openai_params(query, context)
+        )
+        return response.choices[0].message.content
+    
+    # No LLM - just return search results
+    return f"Found {result_count} relevant documents. Set GROQ_API_KEY for AI-powered summaries."
+
+
+async def _stream_groq(query: str, context: str, groq_key: str):
+    """Yield answer text deltas from a streamed Groq completion."""
+    async with get_http_client().stream(
+        "POST",
+        GROQ_URL,
+        headers={"Authorization": f"Bearer {groq_key}"},
+        json=_groq_payload(query, context, stream=True),
+    ) as response:
+        if response.status_code != 200:
+            await response.aread()
+            yield f"Groq API response: {response.status_code}"
+            return
+        
+        async for line in response.aiter_lines():
+            if not line.startswith("data: "):
+                continue
+            chunk = line[len("data: "):]
+            if chunk == "[DONE]":
+                break
+            delta = json.loads(chunk)["choices"][0]["delta"].get("content")
+            if delta:
+                yield delta
+
+
+async def _stream_openai(query: str, context: str, openai_key: str):
+    """Yield answer text deltas from a streamed OpenAI completion."""
+    stream = await get_openai_client(openai_key).chat.completions.create(
+        **_openai_params(query, context), stream=True
+    )
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def _search_error(error: Exception) -> tuple[list[SearchResult], str]:
+    """Error placeholder result and message for a failed search."""
+    error_msg = str(error)
+    results = [SearchResult(
+        doc_id="error",
+        content=f"Search error: {error_msg[:300]}",
+        score=0.0,
+        source="error",
+    )]
+    return results, f"Error: {error_msg[:200]}"
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _count_json_entries(path: Path) -> int:
+    """Parse a JSON file and count its top-level entries (keys or items); raises if invalid."""
+    with open(path, "rb") as f:
+        if HAS_IJSON:
+            count = 0
+            for prefix, event, _ in ijson.parse(f):
+                if prefix == "" and event == "map_key":
+                    count += 1
+                elif prefix == "item" and event in ("start_map", "start_array", "string", "number", "boolean", "null"):
+                    count += 1
+            return count
+        
+        data = orjson.loads(f.read()) if HAS_ORJSON else json.load(f)
+        return len(data)
+
+
+def _save_to_history(user_id: str, query: str, response: str, timestamp_ns: int):
+    """Append a search to the user's history."""
+    get_history_store(HISTORY_DB).add(user_id, query, response, timestamp_ns)
 
 
 if __name__ == "__main__":
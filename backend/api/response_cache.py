@@ -0,0 +1,97 @@
+"""
+response_cache.py - Semantic cache for generated LLM answers.
+
+An answer is reused when the retrieval context is identical (same documents,
+same statute mapping) and the query is either the same text or a paraphrase
+whose embedding has cosine similarity above the threshold. Keying on the
+context keeps "IPC 302" from being answered with a cached "IPC 304" reply.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass
+class _Entry:
+    embedding: Optional[np.ndarray]  # unit-normalized query embedding
+    response: str
+    created: float
+
+
+class SemanticResponseCache:
+    """Bounded, TTL-limited LRU of (context, query) -> LLM answer."""
+
+    def __init__(self, max_entries: int = 1000, threshold: float = 0.95, ttl_seconds: float = 24 * 3600):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[tuple[bytes, str], _Entry]" = OrderedDict()
+
+    @staticmethod
+    def _key(query: str, context: str) -> tuple[bytes, str]:
+        context_digest = hashlib.blake2b(context.encode(), digest_size=16).digest()
+        return context_digest, " ".join(query.lower().split())
+
+    @staticmethod
+    def _unit(embedding) -> Optional[np.ndarray]:
+        if embedding is None:
+            return None
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def get(self, query: str, context: str, embedding=None) -> tuple[Optional[str], Optional[str]]:
+        """
+        Look up a cached answer.
+
+        Returns (response, hit_type) where hit_type is "exact" or "semantic",
+        or (None, None) on a miss.
+        """
+        key = self._key(query, context)
+        now = time.monotonic()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if now - entry.created <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                return entry.response, "exact"
+            del self._entries[key]
+
+        query_vector = self._unit(embedding)
+        if query_vector is None:
+            return None, None
+
+        best_key, best_score = None, self.threshold
+        for (context_digest, _), candidate in self._entries.items():
+            if context_digest != key[0] or candidate.embedding is None:
+                continue
+            if now - candidate.created > self.ttl_seconds:
+                continue
+            score = float(np.dot(candidate.embedding, query_vector))
+            if score >= best_score:
+                best_key, best_score = (context_digest, _), score
+
+        if best_key is None:
+            return None, None
+
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key].response, "semantic"
+
+    def put(self, query: str, context: str, response: str, embedding=None):
+        """Store an answer, evicting the least recently used entry when full."""
+        key = self._key(query, context)
+        self._entries[key] = _Entry(self._unit(embedding), response, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -7,15 +7,21 @@ Endpoints:
 - GET /statute/{code}/{section} - Statute mapping lookup
 - POST /lightrag/query - Direct LightRAG query
 - POST /lightrag/index - Index documents into LightRAG
+- POST /batch - Run several GET/POST calls in one request
 """
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 from typing import Optional, List
 from contextlib import asynccontextmanager
+import asyncio
+import hashlib
+import json
 import os
 import sys
+import httpx
 
 # Add parent to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -24,10 +30,36 @@ from core.knowledge_graph import get_knowledge_graph
 from core.search import get_search_engine
 from core.lightrag_engine import get_lightrag_engine, HAS_LIGHTRAG
 
+# Redis is optional: LightRAG answers are cached there when REDIS_URL is set
+try:
+    import redis.asyncio as aioredis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
+# orjson serializes large KG/search responses several times faster
+try:
+    import orjson  # noqa: F401
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+REDIS_URL = os.getenv("REDIS_URL")
+LIGHTRAG_CACHE_TTL = 300  # seconds
+MAX_BATCH_REQUESTS = 20
+
+_redis = None
+_inflight_queries: dict[str, asyncio.Future] = {}
+
 
 # Lifespan for startup/shutdown
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global _redis
+    if HAS_REDIS and REDIS_URL:
+        _redis = aioredis.Redis.from_url(REDIS_URL)
+        print("LightRAG answer cache: Redis")
+    
     # Startup: Initialize LightRAG
     if HAS_LIGHTRAG:
         engine = get_lightrag_engine()
@@ -41,6 +73,53 @@ async def lifespan(app: FastAPI):
     if HAS_LIGHTRAG:
         engine = get_lightrag_engine()
         await engine.finalize()
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+def _lightrag_cache_key(query: str, mode: str, top_k: int) -> str:
+    canonical = " ".join(query.lower().split())
+    return "lrag:" + hashlib.blake2b(f"{mode}\0{top_k}\0{canonical}".encode(), digest_size=16).hexdigest()
+
+
+async def _query_lightrag(query: str, mode: str, top_k: int) -> dict:
+    """
+    Query LightRAG, coalescing identical in-flight queries into one call.
+    
+    Concurrent requests for the same (query, mode, top_k) await a single
+    LightRAG/LLM call instead of each paying for their own.
+    """
+    key = _lightrag_cache_key(query, mode, top_k)
+    task = _inflight_queries.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_query_lightrag_cached(key, query, mode, top_k))
+        _inflight_queries[key] = task
+        task.add_done_callback(lambda _: _inflight_queries.pop(key, None))
+    # Shielded so one client disconnecting doesn't cancel the others' answer
+    return await asyncio.shield(task)
+
+
+async def _query_lightrag_cached(key: str, query: str, mode: str, top_k: int) -> dict:
+    """Query LightRAG, reusing answers cached in Redis for LIGHTRAG_CACHE_TTL seconds."""
+    engine = get_lightrag_engine()
+    if _redis is None:
+        return await engine.query(query, mode=mode, top_k=top_k)
+    
+    try:
+        cached = await _redis.get(key)
+        if cached:
+            return json.loads(cached)
+    except Exception as e:
+        print(f"Redis cache read failed: {e}")
+    
+    result = await engine.query(query, mode=mode, top_k=top_k)
+    if not result.get("error"):
+        try:
+            await _redis.setex(key, LIGHTRAG_CACHE_TTL, json.dumps(result))
+        except Exception as e:
+            print(f"Redis cache write failed: {e}")
+    return result
 
 
 # Initialize FastAPI
@@ -48,7 +127,8 @@ app = FastAPI(
     title="Legal Lens API",
     description="AI-powered search for Indian legal documents with KG + LightRAG",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if HAS_ORJSON else JSONResponse,
 )
 
 # CORS - allow all origins for development
@@ -74,6 +154,17 @@ class LightRAGQueryRequest(BaseModel):
     top_k: Optional[int] = 5
 
 
+class BatchItem(BaseModel):
+    id: str
+    path: str  # e.g. "/statute/IPC/302"
+    method: str = "GET"
+    body: Optional[dict] = None
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem]
+
+
 class SearchResponse(BaseModel):
     query: str
     statute_mapping: Optional[dict]
@@ -96,7 +187,7 @@ async def health_check():
         "service": "Legal Lens API",
         "version": "2.0.0",
         "kg_nodes": len(kg.nodes),
-        "kg_edges": len(kg.edges),
+        "kg_edges": kg.num_edges,
         "lightrag_available": HAS_LIGHTRAG,
         "lightrag_status": lightrag_engine.get_status()
     }
@@ -116,25 +207,26 @@ async def search(request: SearchRequest):
     if not request.query.strip():
         raise HTTPException(status_code=400, detail="Query cannot be empty")
     
-    # 1. KG + Document Search
+    # 1. KG + Document Search, in a worker thread so it overlaps with LightRAG
     engine = get_search_engine()
-    results = engine.search(request.query, top_k=request.top_k)
+    search_task = asyncio.to_thread(engine.search, request.query, top_k=request.top_k)
     
     # 2. LightRAG Query (if available and enabled)
     lightrag_answer = None
-    if request.use_lightrag and HAS_LIGHTRAG:
-        try:
-            lightrag_engine = get_lightrag_engine()
-            if lightrag_engine.is_initialized:
-                rag_result = await lightrag_engine.query(
-                    request.query, 
-                    mode="hybrid",
-                    top_k=request.top_k
-                )
-                if not rag_result.get("error"):
-                    lightrag_answer = rag_result.get("answer")
-        except Exception as e:
-            print(f"LightRAG query error: {e}")
+    if request.use_lightrag and HAS_LIGHTRAG and get_lightrag_engine().is_initialized:
+        results, rag_result = await asyncio.gather(
+            search_task,
+            _query_lightrag(request.query, mode="hybrid", top_k=request.top_k),
+            return_exceptions=True,
+        )
+        if isinstance(results, BaseException):
+            raise results
+        if isinstance(rag_result, BaseException):
+            print(f"LightRAG query error: {rag_result}")
+        elif not rag_result.get("error"):
+            lightrag_answer = rag_result.get("answer")
+    else:
+        results = await search_task
     
     # Combine results
     return {
@@ -165,7 +257,7 @@ async def lightrag_query(request: LightRAGQueryRequest):
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to init LightRAG: {e}")
     
-    result = await lightrag_engine.query(
+    result = await _query_lightrag(
         request.query,
         mode=request.mode,
         top_k=request.top_k
@@ -261,6 +353,38 @@ async def get_concept_judgments(concept_id: str):
     }
 
 
+@app.post("/batch")
+async def batch(request: BatchRequest):
+    """
+    Fold several API calls into one HTTP request.
+    
+    Sub-requests are dispatched in-process through this app and run
+    concurrently; each response carries the caller's id, status and body.
+    """
+    if len(request.requests) > MAX_BATCH_REQUESTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_REQUESTS} requests per batch"
+        )
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://batch") as client:
+        async def run(item: BatchItem) -> dict:
+            if not item.path.startswith("/") or item.path.startswith(("//", "/batch")):
+                return {"id": item.id, "status": 400, "body": {"detail": f"Invalid batch path: {item.path}"}}
+            
+            response = await client.request(item.method.upper(), item.path, json=item.body)
+            try:
+                body = response.json()
+            except ValueError:
+                body = response.text
+            return {"id": item.id, "status": response.status_code, "body": body}
+        
+        responses = await asyncio.gather(*(run(item) for item in request.requests))
+    
+    return {"responses": responses}
+
+
 @app.get("/kg/stats")
 async def kg_stats():
     """Get Knowledge Graph statistics."""
@@ -272,7 +396,7 @@ async def kg_stats():
     
     return {
         "total_nodes": len(kg.nodes),
-        "total_edges": len(kg.edges),
+        "total_edges": kg.num_edges,
         "judgments": len(judgments),
         "statutes": len(statutes),
         "concepts": len(concepts)
@@ -282,4 +406,15 @@ async def kg_stats():
 # Run with: uvicorn app:app --reload --port 8000
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # One worker process per core (each loads its own KG/LightRAG singletons).
+    # loop/http "auto" use uvloop and httptools when installed (uvicorn[standard]).
+    uvicorn.run(
+        "app:app",
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        loop="auto",
+        http="auto",
+        log_level="warning",
+    )
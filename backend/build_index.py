@@ -14,11 +14,14 @@ Usage:
 The generated index files will be committed to the repo and used by the server.
 """
 
+import hashlib
 import json
 import os
+import re
 import sys
 import pickle
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional
@@ -26,12 +29,46 @@ from typing import List, Dict, Optional
 # Add parent to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+
+# pypdfium2 extracts text several times faster than pdfminer when installed
+try:
+    import pypdfium2
+    HAS_PDFIUM = True
+except ImportError:
+    HAS_PDFIUM = False
+
+# orjson serializes large document lists several times faster when installed
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def write_json(path: Path, data) -> None:
+    """Write data as indented UTF-8 JSON."""
+    if HAS_ORJSON:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
 
 def extract_text_from_pdf(pdf_path: Path) -> str:
     """Extract text from a PDF file."""
     try:
-        from pdfminer.high_level import extract_text
-        text = extract_text(str(pdf_path))
+        if HAS_PDFIUM:
+            pdf = pypdfium2.PdfDocument(str(pdf_path))
+            try:
+                text = "\n".join(page.get_textpage().get_text_range() for page in pdf)
+            finally:
+                pdf.close()
+        else:
+            from pdfminer.high_level import extract_text
+            text = extract_text(str(pdf_path))
         return text.strip()
     except Exception as e:
         print(f"  [ERROR] Could not extract text from {pdf_path.name}: {e}")
@@ -42,20 +79,21 @@ def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[st
     """Split text into overlapping chunks for better search."""
     chunks = []
     start = 0
+    # Sentence boundaries, found once; each chunk binary-searches for its last period
+    periods = np.fromiter((m.start() for m in re.finditer(r"\.", text)), dtype=np.int64)
     
     while start < len(text):
         end = start + chunk_size
-        chunk = text[start:end]
         
         # Try to break at sentence boundary
         if end < len(text):
-            last_period = chunk.rfind('.')
-            if last_period > chunk_size // 2:
-                end = start + last_period + 1
-                chunk = text[start:end]
+            i = np.searchsorted(periods, end) - 1
+            if i >= 0 and periods[i] - start > chunk_size // 2:
+                end = int(periods[i]) + 1
         
-        if chunk.strip():
-            chunks.append(chunk.strip())
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
         
         start = end - overlap
     
@@ -147,15 +185,21 @@ def process_pdf_folder(folder_path: Path) -> List[Dict]:
         folder_path.mkdir(parents=True, exist_ok=True)
         return documents
     
-    pdf_files = list(folder_path.glob("*.pdf"))
+    # One scandir pass; file type comes from the directory entry, no stat per path
+    with os.scandir(folder_path) as entries:
+        pdf_files = sorted(
+            Path(entry.path) for entry in entries
+            if entry.is_file() and entry.name.lower().endswith(".pdf")
+        )
     print(f"\nFound {len(pdf_files)} PDF files in {folder_path}")
     
-    for pdf_path in pdf_files:
+    # Parsing is CPU-bound: extract all PDFs in parallel, one process per core
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        texts = list(executor.map(extract_text_from_pdf, pdf_files))
+    
+    for pdf_path, text in zip(pdf_files, texts):
         print(f"\nProcessing: {pdf_path.name}")
         
-        # Extract text
-        text = extract_text_from_pdf(pdf_path)
-        
         if not text:
             print(f"  [SKIP] No text extracted")
             continue
@@ -200,11 +244,68 @@ def process_pdf_folder(folder_path: Path) -> List[Dict]:
     return documents
 
 
+def document_hash(doc: Dict) -> str:
+    """Content hash identifying a document's embedding (model, title and content)."""
+    text = f"{EMBEDDING_MODEL}\0{doc['title']} {doc['content']}"
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def load_cached_embeddings(output_dir: Path) -> Dict[str, np.ndarray]:
+    """Map document hash -> embedding from the previous build, if any."""
+    hashes_file = output_dir / "hashes.json"
+    embeddings_file = output_dir / "embeddings.npy"
+    if not (hashes_file.exists() and embeddings_file.exists()):
+        return {}
+    
+    with open(hashes_file, "r", encoding="utf-8") as f:
+        hashes = json.load(f)
+    embeddings = np.load(embeddings_file)
+    if len(hashes) != len(embeddings):
+        return {}
+    return dict(zip(hashes, embeddings))
+
+
+# Corpus sizes above which exhaustive search gives way to an approximate index
+HNSW_MIN_DOCUMENTS = 2_000
+IVFPQ_MIN_DOCUMENTS = 100_000
+
+
+def build_ann_index(embeddings: np.ndarray):
+    """
+    Build an approximate nearest-neighbour index for large corpora.
+    
+    Returns (index, index_type, file_name), or (None, None, None) when the
+    corpus is small enough that the exhaustive index is the better choice.
+    """
+    import faiss
+    
+    num_vectors, dimension = embeddings.shape
+    if num_vectors > IVFPQ_MIN_DOCUMENTS:
+        # 4-bit PQ codes let fast-scan evaluate lookup tables with SIMD shuffles,
+        # 32 codes per instruction, instead of one gather per code
+        nlist = int(np.sqrt(num_vectors))
+        quantizer = faiss.IndexFlatIP(dimension)
+        index = faiss.IndexIVFPQFastScan(quantizer, dimension, nlist, 16, 4, faiss.METRIC_INNER_PRODUCT)
+        index.train(embeddings)
+        index.add(embeddings)
+        index.nprobe = 16
+        return index, f"IndexIVFPQFastScan(nlist={nlist},m=16,nbits=4)", "faiss_fastscan.index"
+    
+    if num_vectors > HNSW_MIN_DOCUMENTS:
+        index = faiss.IndexHNSWFlat(dimension, 32, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = 200
+        index.add(embeddings)
+        return index, "IndexHNSWFlat(M=32)", "faiss_ann.index"
+    
+    return None, None, None
+
+
 def build_faiss_index(documents: List[Dict], output_dir: Path) -> bool:
     """Build FAISS index from documents."""
     try:
         from sentence_transformers import SentenceTransformer
         import faiss
+        import torch
     except ImportError:
         print("\n[ERROR] Required packages not installed. Run:")
         print("  pip install sentence-transformers faiss-cpu")
@@ -214,34 +315,66 @@ def build_faiss_index(documents: List[Dict], output_dir: Path) -> bool:
     print("Building FAISS Index")
     print(f"{'='*60}")
     
-    # Load model
-    print("\nLoading embedding model (all-MiniLM-L6-v2)...")
-    model = SentenceTransformer("all-MiniLM-L6-v2")
-    print("  Model loaded!")
+    # Reuse embeddings from the previous build for documents that haven't changed
+    hashes = [document_hash(doc) for doc in documents]
+    cached = load_cached_embeddings(output_dir)
+    missing = [i for i, h in enumerate(hashes) if h not in cached]
+    print(f"\nReusing {len(documents) - len(missing)} cached embeddings, encoding {len(missing)}")
     
-    # Generate embeddings
-    print(f"\nGenerating embeddings for {len(documents)} documents...")
-    texts = [f"{doc['title']} {doc['content']}" for doc in documents]
-    embeddings = model.encode(texts, show_progress_bar=True)
-    print(f"  Generated {embeddings.shape[0]} embeddings of dimension {embeddings.shape[1]}")
+    if missing:
+        # Load model on the fastest available device
+        if torch.cuda.is_available():
+            device = "cuda"
+        elif torch.backends.mps.is_available():
+            device = "mps"
+        else:
+            device = "cpu"
+        print(f"\nLoading embedding model ({EMBEDDING_MODEL}) on {device}...")
+        model = SentenceTransformer(EMBEDDING_MODEL, device=device)
+        if device == "cuda" and torch.cuda.get_device_capability()[0] >= 8:
+            # Ampere+ benefits from fused kernels
+            model[0].auto_model = torch.compile(model[0].auto_model)
+        print("  Model loaded!")
+        
+        # Generate embeddings
+        print(f"\nGenerating embeddings for {len(missing)} documents...")
+        texts = [f"{documents[i]['title']} {documents[i]['content']}" for i in missing]
+        # Normalized for cosine similarity inside encode, batch by batch
+        encoded = model.encode(
+            texts,
+            batch_size=256 if device == "cuda" else 64,
+            show_progress_bar=True,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+        del texts
+        cached.update(zip((hashes[i] for i in missing), encoded))
     
-    # Normalize for cosine similarity
-    faiss.normalize_L2(embeddings)
+    embeddings = np.stack([cached[h] for h in hashes]).astype(np.float32)
+    print(f"  Have {embeddings.shape[0]} embeddings of dimension {embeddings.shape[1]}")
     
-    # Create FAISS index
+    # Create FAISS index: 8-bit scalar quantized, 4x smaller than IndexFlatIP
+    # and 4x less memory scanned per query, at near-identical recall
     print("\nBuilding FAISS index...")
     dimension = embeddings.shape[1]
-    index = faiss.IndexFlatIP(dimension)  # Inner product = cosine sim for normalized vectors
+    index = faiss.IndexScalarQuantizer(
+        dimension, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT  # = cosine sim for normalized vectors
+    )
+    index.train(embeddings)
     index.add(embeddings)
     print(f"  Index contains {index.ntotal} vectors")
     
+    # Sub-linear search once the corpus outgrows exhaustive scans
+    ann_index, ann_index_type, ann_index_name = build_ann_index(embeddings)
+    if ann_index is not None:
+        print(f"  Built {ann_index_type} for {len(documents)} documents")
+    
     # Save everything
     output_dir.mkdir(parents=True, exist_ok=True)
     
     # Save documents
     docs_file = output_dir / "documents.json"
-    with open(docs_file, "w", encoding="utf-8") as f:
-        json.dump(documents, f, indent=2, ensure_ascii=False)
+    write_json(docs_file, documents)
     print(f"\nSaved documents to: {docs_file}")
     
     # Save FAISS index
@@ -249,22 +382,43 @@ def build_faiss_index(documents: List[Dict], output_dir: Path) -> bool:
     faiss.write_index(index, str(index_file))
     print(f"Saved FAISS index to: {index_file}")
     
-    # Save embeddings as numpy array (backup)
+    # faiss.index stays as the exact fallback next to the approximate index
+    if ann_index is not None:
+        ann_index_file = output_dir / ann_index_name
+        faiss.write_index(ann_index, str(ann_index_file))
+        print(f"Saved ANN index to: {ann_index_file}")
+    
+    # Save a 1-bit sign-quantized index (32x smaller) for prefiltering before
+    # rescoring candidates against the float16 embeddings below
+    binary_index = faiss.IndexBinaryFlat(dimension)
+    binary_index.add(np.packbits(embeddings > 0, axis=1))
+    binary_index_file = output_dir / "binary.index"
+    faiss.write_index_binary(binary_index, str(binary_index_file))
+    print(f"Saved binary index to: {binary_index_file}")
+    
+    # Save embeddings as numpy array (backup), half precision
     embeddings_file = output_dir / "embeddings.npy"
-    np.save(embeddings_file, embeddings)
+    np.save(embeddings_file, embeddings.astype(np.float16))
     print(f"Saved embeddings to: {embeddings_file}")
     
+    # Save the content hash of each row so the next build can skip re-encoding it
+    hashes_file = output_dir / "hashes.json"
+    write_json(hashes_file, hashes)
+    print(f"Saved document hashes to: {hashes_file}")
+    
     # Save metadata
     metadata = {
         "created_at": datetime.now().isoformat(),
         "num_documents": len(documents),
-        "embedding_model": "all-MiniLM-L6-v2",
+        "embedding_model": EMBEDDING_MODEL,
         "embedding_dimension": dimension,
-        "index_type": "IndexFlatIP"
+        "index_type": "IndexScalarQuantizer(QT_8bit)",
+        "ann_index_type": ann_index_type,
+        "ann_index_file": ann_index_name,
+        "embedding_dtype": "float16"
     }
     metadata_file = output_dir / "index_metadata.json"
-    with open(metadata_file, "w") as f:
-        json.dump(metadata, f, indent=2)
+    write_json(metadata_file, metadata)
     print(f"Saved metadata to: {metadata_file}")
     
     return True
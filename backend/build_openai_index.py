@@ -14,40 +14,100 @@ Usage:
 This creates openai_embeddings.npy which the server loads for semantic search.
 """
 
+import asyncio
 import json
 import os
 import sys
 import time
+from email.utils import parsedate_to_datetime
+import httpx
 import numpy as np
 from pathlib import Path
 from typing import List
 
+from build_index import write_json
+
 # OpenAI API settings
 EMBEDDING_MODEL = "text-embedding-3-small"
 EMBEDDING_DIM = 1536
 
+# Documents per /v1/embeddings request (the endpoint accepts a list as input)
+EMBEDDING_BATCH_SIZE = 96
+MAX_RETRIES = 5
+# Batches in flight at once over the shared connection pool
+MAX_CONCURRENT_REQUESTS = 8
 
-def get_embedding(text: str, api_key: str) -> np.ndarray:
-    """Get embedding from OpenAI API."""
-    import requests
-    
-    response = requests.post(
-        "https://api.openai.com/v1/embeddings",
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        },
-        json={
-            "model": EMBEDDING_MODEL,
-            "input": text
-        }
-    )
+# HTTP/2 needs the optional h2 package
+try:
+    import h2  # noqa: F401
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
+
+def retry_delay(retry_after, attempt: int) -> float:
+    """Seconds to wait: Retry-After as seconds or an HTTP date, else exponential backoff."""
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+    return float(2 ** attempt)
+
+
+async def get_embeddings_batch(client: httpx.AsyncClient, texts: List[str]) -> np.ndarray:
+    """Get embeddings for a batch of texts from OpenAI API, one row per text."""
+    for attempt in range(MAX_RETRIES):
+        response = await client.post(
+            "https://api.openai.com/v1/embeddings",
+            json={
+                "model": EMBEDDING_MODEL,
+                "input": texts
+            },
+        )
+        
+        if response.status_code == 200:
+            data = sorted(response.json()["data"], key=lambda d: d["index"])
+            return np.stack([d["embedding"] for d in data])
+        
+        # Back off on rate limits and transient server errors
+        if response.status_code != 429 and response.status_code < 500:
+            break
+        if attempt == MAX_RETRIES - 1:
+            break  # out of attempts: fail now rather than sleep first
+        delay = retry_delay(response.headers.get("Retry-After"), attempt)
+        print(f"  HTTP {response.status_code}, retrying in {delay:.0f}s")
+        await asyncio.sleep(delay)
+    
+    raise Exception(f"API error {response.status_code}: {response.text}")
+
+
+async def embed_all(texts: List[str], api_key: str) -> np.ndarray:
+    """Embed texts in concurrent batches over one pooled client; rows keep input order."""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    batches = [texts[i:i + EMBEDDING_BATCH_SIZE] for i in range(0, len(texts), EMBEDDING_BATCH_SIZE)]
+    done = 0
+    
+    async with httpx.AsyncClient(
+        http2=HAS_H2,
+        timeout=60.0,
+        headers={"Authorization": f"Bearer {api_key}"},
+    ) as client:
+        async def bounded(batch: List[str]) -> np.ndarray:
+            nonlocal done
+            async with semaphore:
+                embeddings = await get_embeddings_batch(client, batch)
+            done += len(batch)
+            print(f"  [{done}/{len(texts)}] batch of {len(batch)} OK")
+            return embeddings
+        
+        results = await asyncio.gather(*(bounded(batch) for batch in batches))
     
-    if response.status_code == 200:
-        data = response.json()
-        return np.array(data["data"][0]["embedding"])
-    else:
-        raise Exception(f"API error {response.status_code}: {response.text}")
+    return np.concatenate(results)
 
 
 def load_documents(data_dir: Path) -> List[dict]:
@@ -113,8 +173,7 @@ def create_sample_documents(data_dir: Path) -> List[dict]:
     ]
     
     data_dir.mkdir(parents=True, exist_ok=True)
-    with open(data_dir / "documents.json", "w", encoding="utf-8") as f:
-        json.dump(documents, f, indent=2, ensure_ascii=False)
+    write_json(data_dir / "documents.json", documents)
     
     print(f"Created sample documents at {data_dir / 'documents.json'}")
     return documents
@@ -146,28 +205,22 @@ def main():
     
     # Generate embeddings
     print(f"\nGenerating embeddings using {EMBEDDING_MODEL}...")
-    embeddings = []
+    # Combine title and content for embedding
+    texts = [f"{doc['title']}\n{doc['content']}" for doc in documents]
     
-    for i, doc in enumerate(documents):
-        # Combine title and content for embedding
-        text = f"{doc['title']}\n{doc['content']}"
-        
-        print(f"  [{i+1}/{len(documents)}] {doc['doc_id']}...", end=" ")
-        
-        try:
-            embedding = get_embedding(text, api_key)
-            embeddings.append(embedding)
-            print("OK")
-        except Exception as e:
-            print(f"ERROR: {e}")
-            return 1
-        
-        # Rate limiting
-        time.sleep(0.2)
+    try:
+        embeddings_array = asyncio.run(embed_all(texts, api_key))
+    except Exception as e:
+        print(f"ERROR: {e}")
+        return 1
     
     # Save embeddings
-    embeddings_array = np.array(embeddings)
+    # L2-normalize in place (no temporary copy of the matrix), then store in
+    # half precision: halves the file and load size; the server computes in float32
+    embeddings_array = embeddings_array.astype(np.float32, copy=False)
+    embeddings_array /= np.linalg.norm(embeddings_array, axis=1, keepdims=True).clip(1e-12)
     output_file = data_dir / "openai_embeddings.npy"
+    embeddings_array = embeddings_array.astype(np.float16)
     np.save(output_file, embeddings_array)
     
     print(f"\n{'=' * 60}")
@@ -181,11 +234,12 @@ def main():
     metadata = {
         "model": EMBEDDING_MODEL,
         "dimension": EMBEDDING_DIM,
+        "dtype": "float16",
+        "normalized": True,
         "num_documents": len(documents),
         "created_at": str(np.datetime64('now'))
     }
-    with open(data_dir / "openai_index_metadata.json", "w") as f:
-        json.dump(metadata, f, indent=2)
+    write_json(data_dir / "openai_index_metadata.json", metadata)
     
     print("\nNext steps:")
     print("  1. git add backend/data/")
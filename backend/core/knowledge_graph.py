@@ -8,16 +8,80 @@ Provides graph-based access to:
 """
 
 import json
+import heapq
+import mmap
 import os
-from typing import Dict, List, Optional, Any
+import pickle
+import sys
+import threading
+from collections import OrderedDict, defaultdict, deque
+from itertools import chain
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
 from pathlib import Path
 
-# Try to import networkx, fall back to simple dict-based graph if not available
+import numpy as np
+
+# orjson parses large JSON files several times faster when installed
 try:
-    import networkx as nx
-    HAS_NETWORKX = True
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    HAS_NETWORKX = False
+    HAS_ORJSON = False
+
+
+def load_json(path: str) -> Any:
+    """Read a UTF-8 JSON file."""
+    if HAS_ORJSON and os.path.getsize(path) > 0:
+        # Parse straight from the page cache; no intermediate bytes copy
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# Bump when the preprocessed state layout changes, to invalidate old caches
+CACHE_VERSION = 5
+
+
+def source_signature(paths: List[str]) -> tuple:
+    """Identify the exact source files a cache was built from."""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((path, None, None))
+    return (CACHE_VERSION, tuple(signature))
+
+
+def read_cache(cache_path: str, signature: tuple) -> Optional[Dict]:
+    """Load pickled preprocessed state, or None if missing, unreadable or stale."""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_signature, state = pickle.load(f)
+    except Exception as e:
+        print(f"Warning: ignoring unreadable cache {cache_path}: {e}")
+        return None
+    return state if cached_signature == signature else None
+
+
+def write_cache(cache_path: str, signature: tuple, state: Dict) -> None:
+    """Pickle preprocessed state next to its sources (atomic replace)."""
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((signature, state), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: could not write cache {cache_path}: {e}")
+
+
+# Node types returned by get_all_statutes
+STATUTE_TYPES = ("old_statute", "new_statute", "statute_reference")
 
 
 class KnowledgeGraph:
@@ -28,58 +92,141 @@ class KnowledgeGraph:
     Edges: REPLACED_BY, CITES, INTERPRETS, RELATED_TO, etc.
     """
     
-    def __init__(self, kg_path: Optional[str] = None, mapping_path: Optional[str] = None):
+    QUERY_CACHE_SIZE = 4096  # memoized lookup results per instance
+    
+    def __init__(
+        self,
+        kg_path: Optional[str] = None,
+        mapping_path: Optional[str] = None,
+        cache_path: Optional[str] = None
+    ):
         """
         Initialize the Knowledge Graph.
         
         Args:
             kg_path: Path to knowledge_graph.json
             mapping_path: Path to mapping.json (optional, for additional mappings)
+            cache_path: Pickle of the preprocessed graph (default: next to kg_path)
         """
         # Default paths relative to project structure
         base_dir = Path(__file__).parent.parent.parent
         
         self.kg_path = kg_path or str(base_dir / "data" / "knowledge_graph.json")
         self.mapping_path = mapping_path or str(base_dir / "data" / "mapping.json")
+        self.cache_path = cache_path or str(Path(self.kg_path).with_suffix(".cache.pkl"))
         
         # Internal storage
         self.nodes: Dict[str, Dict] = {}
-        self.edges: List[Dict] = []
-        self.statute_mappings: Dict[str, Dict] = {}  # IPC_302 -> BNS info
         
-        # NetworkX graph (if available)
-        self.graph = None
+        # Edges as parallel arrays (structure of arrays): endpoint positions in
+        # node_ids and a relationship code, a few bytes per edge instead of a dict
+        self.node_ids: List[str] = []  # nodes in load order, then unknown edge endpoints
+        self.node_idx: Dict[str, int] = {}
+        self.rel_codes: Dict[str, int] = {}  # relationship -> code, in first-seen order
+        self.edge_src = np.empty(0, dtype=np.int32)
+        self.edge_dst = np.empty(0, dtype=np.int32)
+        self.edge_rel = np.empty(0, dtype=np.int16)
+        
+        self.statute_mappings: Dict[str, Dict] = {}  # IPC_302 -> BNS info
+        self.nodes_by_type: Dict[str, List[Dict]] = defaultdict(list)  # in load order
+        self.statute_nodes: List[Dict] = []  # old, new and referenced statutes
+        
+        # Adjacency indexes: relationship -> node -> neighbour ids
+        self.out_by_rel: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        self.in_by_rel: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        self.out_all: Dict[str, Tuple[str, ...]] = {}
+        self.in_all: Dict[str, Tuple[str, ...]] = {}
+        
+        # Per-instance LRU of query results as immutable id tuples; never pickled,
+        # so every (re)load of the graph starts with an empty cache
+        self._query_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        
+        # Reuse the preprocessed graph while the source files are unchanged
+        signature = source_signature([self.kg_path, self.mapping_path])
+        cached = read_cache(self.cache_path, signature)
+        if cached is not None:
+            self.__dict__.update(cached)
+            print(f"Loaded KG from cache: {len(self.nodes)} nodes, {self.num_edges} edges")
+            return
         
         # Load data
         self._load_knowledge_graph()
         self._load_mappings()
         self._build_graph()
+        self._build_search_index()
+        
+        if os.path.exists(self.kg_path):
+            write_cache(self.cache_path, signature, self._cache_state())
+    
+    def _cache_state(self) -> Dict:
+        """Preprocessed attributes to pickle (everything but the paths and query cache)."""
+        skip = ("kg_path", "mapping_path", "cache_path", "_query_cache", "_query_cache_lock")
+        return {k: v for k, v in vars(self).items() if k not in skip}
     
-    def _load_knowledge_graph(self):
+    def _load_knowledge_graph(self) -> None:
         """Load the knowledge graph JSON file."""
         if not os.path.exists(self.kg_path):
             print(f"Warning: KG file not found at {self.kg_path}")
             return
         
-        with open(self.kg_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json(self.kg_path)
         
-        # Index nodes by ID
+        # Index nodes by ID. Ids are interned so the node table, edge endpoints
+        # and adjacency indexes all share one string object per node
         for node in data.get("nodes", []):
+            node["id"] = sys.intern(node["id"])
             self.nodes[node["id"]] = node
         
-        # Store edges
-        self.edges = data.get("links", [])
+        for node in self.nodes.values():
+            self.nodes_by_type[node.get("type")].append(node)
+            if node.get("type") in STATUTE_TYPES:
+                self.statute_nodes.append(node)
         
-        print(f"Loaded KG: {len(self.nodes)} nodes, {len(self.edges)} edges")
+        # Store edges
+        self.node_ids = list(self.nodes)
+        self.node_idx = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        
+        def index_of(node_id: str) -> int:
+            node_id = sys.intern(node_id)
+            if node_id not in self.node_idx:
+                self.node_idx[node_id] = len(self.node_ids)
+                self.node_ids.append(node_id)
+            return self.node_idx[node_id]
+        
+        src, dst, rel = [], [], []
+        for edge in data.get("links", []):
+            relationship = sys.intern(edge.get("relationship", "RELATED_TO"))
+            src.append(index_of(edge["source"]))
+            dst.append(index_of(edge["target"]))
+            rel.append(self.rel_codes.setdefault(relationship, len(self.rel_codes)))
+        
+        self.edge_src = np.array(src, dtype=np.int32)
+        self.edge_dst = np.array(dst, dtype=np.int32)
+        self.edge_rel = np.array(rel, dtype=np.int16)
+        
+        print(f"Loaded KG: {len(self.nodes)} nodes, {self.num_edges} edges")
     
-    def _load_mappings(self):
+    @property
+    def num_edges(self) -> int:
+        """Number of edges in the graph."""
+        return len(self.edge_src)
+    
+    @property
+    def edges(self) -> List[Dict]:
+        """Edges as source/target/relationship dicts (built on each access)."""
+        rel_names = list(self.rel_codes)
+        return [
+            {"source": self.node_ids[s], "target": self.node_ids[t], "relationship": rel_names[r]}
+            for s, t, r in zip(self.edge_src.tolist(), self.edge_dst.tolist(), self.edge_rel.tolist())
+        ]
+    
+    def _load_mappings(self) -> None:
         """Load additional statute mappings."""
         if not os.path.exists(self.mapping_path):
             return
         
-        with open(self.mapping_path, 'r', encoding='utf-8') as f:
-            mappings = json.load(f)
+        mappings = load_json(self.mapping_path)
         
         for m in mappings:
             old_key = f"{m['old_code']}_{m['old_section']}"
@@ -91,28 +238,123 @@ class KnowledgeGraph:
                 "title": m.get("title", "")
             }
     
-    def _build_graph(self):
-        """Build NetworkX graph if available."""
-        if not HAS_NETWORKX:
-            return
-        
-        self.graph = nx.DiGraph()
-        
-        # Add nodes
-        for node_id, node_data in self.nodes.items():
-            self.graph.add_node(node_id, **node_data)
-        
-        # Add edges
-        for edge in self.edges:
-            self.graph.add_edge(
-                edge["source"],
-                edge["target"],
-                relationship=edge.get("relationship", "RELATED_TO")
-            )
+    def _build_graph(self) -> None:
+        """Build adjacency indexes and resolve REPLACED_BY mappings."""
+        # CSR-style adjacency: a query is one dict lookup plus a scan of the
+        # node's own neighbours, instead of a pass over every edge
+        out_by_rel = defaultdict(lambda: defaultdict(list))
+        in_by_rel = defaultdict(lambda: defaultdict(list))
+        out_all = defaultdict(list)
+        in_all = defaultdict(list)
+        
+        rel_names = list(self.rel_codes)
+        for s, t, r in zip(self.edge_src.tolist(), self.edge_dst.tolist(), self.edge_rel.tolist()):
+            source, target, relationship = self.node_ids[s], self.node_ids[t], rel_names[r]
+            out_by_rel[relationship][source].append(target)
+            in_by_rel[relationship][target].append(source)
+            out_all[source].append(target)
+            in_all[target].append(source)
+        
+        self.out_by_rel = {rel: {n: tuple(ids) for n, ids in adj.items()} for rel, adj in out_by_rel.items()}
+        self.in_by_rel = {rel: {n: tuple(ids) for n, ids in adj.items()} for rel, adj in in_by_rel.items()}
+        self.out_all = {n: tuple(ids) for n, ids in out_all.items()}
+        self.in_all = {n: tuple(ids) for n, ids in in_all.items()}
+        
+        # Old statute -> the node that replaced it (first REPLACED_BY edge to a known node)
+        self.replaced_by: Dict[str, str] = {}
+        for source, targets in self.out_by_rel.get("REPLACED_BY", {}).items():
+            target = next((t for t in targets if t in self.nodes), None)
+            if target is not None:
+                self.replaced_by[source] = target
+        
+        # Resolve graph-derived mappings up front so a lookup is one dict access;
+        # entries from the mapping file take precedence
+        for key, new_id in self.replaced_by.items():
+            old_node = self.nodes.get(key)
+            if key in self.statute_mappings or not old_node:
+                continue
+            new_node = self.nodes[new_id]
+            old_code, _, old_section = key.partition("_")
+            self.statute_mappings[key] = {
+                "old_code": old_node.get("code", old_code),
+                "old_section": old_node.get("section", old_section),
+                "new_code": new_node.get("code", "BNS"),
+                "new_section": new_node.get("section", ""),
+                "description": new_node.get("description", ""),
+                "title": old_node.get("description", "")
+            }
+    
+    def _build_search_index(self) -> None:
+        """Precompute lowercased searchable fields and a trigram index over them."""
+        self._node_order: Dict[str, int] = {}
+        self.node_lower: Dict[str, Tuple[Tuple[str, float], ...]] = {}  # node_id -> ((text, weight), ...)
+        trigram_index = defaultdict(set)
+        
+        for position, (node_id, node) in enumerate(self.nodes.items()):
+            fields = [
+                (node_id.lower(), 0.5),
+                (node.get("title", "").lower(), 0.4),
+                (node.get("description", "").lower(), 0.3),
+                (node.get("summary", "").lower(), 0.3),
+                (node.get("name", "").lower(), 0.4),
+            ]
+            if node.get("section"):
+                fields.append((str(node.get("section")).lower(), 0.5))
+            
+            self._node_order[node_id] = position
+            self.node_lower[node_id] = tuple(fields)
+            for text, _ in fields:
+                for i in range(len(text) - 2):
+                    trigram_index[text[i:i + 3]].add(node_id)
+        
+        self.trigram_index: Dict[str, FrozenSet[str]] = {g: frozenset(ids) for g, ids in trigram_index.items()}
+        self._ids_by_type: Dict[str, FrozenSet[str]] = {
+            t: frozenset(n["id"] for n in nodes) for t, nodes in self.nodes_by_type.items()
+        }
+    
+    def _candidate_nodes(self, query_lower: str, node_type: Optional[str] = None) -> Iterable[str]:
+        """Node ids (of node_type, if given) whose fields could contain query_lower, in load order."""
+        if len(query_lower) < 3:
+            if node_type:
+                return [n["id"] for n in self.nodes_by_type.get(node_type, ())]
+            return self.nodes.keys()
+        
+        # A field containing the query contains every trigram of it
+        grams = {query_lower[i:i + 3] for i in range(len(query_lower) - 2)}
+        postings = [self.trigram_index.get(g, frozenset()) for g in grams]
+        if node_type:
+            postings.append(self._ids_by_type.get(node_type, frozenset()))
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        return sorted(candidates, key=self._node_order.__getitem__)
     
     # =========================================================================
     # QUERY METHODS
     # =========================================================================
+    # The graph is read-only once loaded, so lookups are memoized per instance
+    # as tuples of node ids; each call builds a fresh result list from them.
+    
+    def _memoized(self, key: tuple, compute) -> tuple:
+        """Cached result of compute() for key, evicting the least recently used."""
+        with self._query_cache_lock:
+            value = self._query_cache.get(key)
+            if value is not None:
+                self._query_cache.move_to_end(key)
+                return value
+        
+        value = compute()
+        with self._query_cache_lock:
+            self._query_cache[key] = value
+            if len(self._query_cache) > self.QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return value
+    
+    def _neighbours_of_type(self, index: Dict[str, Tuple[str, ...]], node_id: str, node_type: str) -> Tuple[str, ...]:
+        """Neighbour ids of node_id in an adjacency index, keeping only node_type."""
+        return tuple(
+            neighbour for neighbour in index.get(node_id, ())
+            if self.nodes.get(neighbour, {}).get("type") == node_type
+        )
     
     def get_statute_mapping(self, code: str, section: str) -> Optional[Dict]:
         """
@@ -125,32 +367,8 @@ class KnowledgeGraph:
         Returns:
             Mapping info or None if not found
         """
-        key = f"{code}_{section}"
-        
-        # Check pre-loaded mappings first
-        if key in self.statute_mappings:
-            return self.statute_mappings[key]
-        
-        # Fall back to KG nodes
-        old_node = self.nodes.get(key)
-        if not old_node:
-            return None
-        
-        # Find REPLACED_BY edge
-        for edge in self.edges:
-            if edge["source"] == key and edge.get("relationship") == "REPLACED_BY":
-                new_node = self.nodes.get(edge["target"])
-                if new_node:
-                    return {
-                        "old_code": old_node.get("code", code),
-                        "old_section": old_node.get("section", section),
-                        "new_code": new_node.get("code", "BNS"),
-                        "new_section": new_node.get("section", ""),
-                        "description": new_node.get("description", ""),
-                        "title": old_node.get("description", "")
-                    }
-        
-        return None
+        # Mapping-file and KG REPLACED_BY entries are merged at load time
+        return self.statute_mappings.get(f"{code}_{section}")
     
     def find_judgments_citing_statute(self, code: str, section: str) -> List[Dict]:
         """
@@ -164,15 +382,11 @@ class KnowledgeGraph:
             List of judgment nodes
         """
         statute_id = f"{code}_{section}"
-        judgments = []
-        
-        for edge in self.edges:
-            if edge["target"] == statute_id and edge.get("relationship") == "CITES":
-                judgment = self.nodes.get(edge["source"])
-                if judgment and judgment.get("type") == "judgment":
-                    judgments.append(judgment)
-        
-        return judgments
+        judgment_ids = self._memoized(
+            ("citing", statute_id),
+            lambda: self._neighbours_of_type(self.in_by_rel.get("CITES", {}), statute_id, "judgment"),
+        )
+        return [self.nodes[node_id] for node_id in judgment_ids]
     
     def get_related_concepts(self, judgment_id: str) -> List[Dict]:
         """
@@ -184,15 +398,11 @@ class KnowledgeGraph:
         Returns:
             List of concept nodes
         """
-        concepts = []
-        
-        for edge in self.edges:
-            if edge["source"] == judgment_id and edge.get("relationship") == "INTERPRETS":
-                concept = self.nodes.get(edge["target"])
-                if concept and concept.get("type") == "concept":
-                    concepts.append(concept)
-        
-        return concepts
+        concept_ids = self._memoized(
+            ("concepts", judgment_id),
+            lambda: self._neighbours_of_type(self.out_by_rel.get("INTERPRETS", {}), judgment_id, "concept"),
+        )
+        return [self.nodes[node_id] for node_id in concept_ids]
     
     def find_related_judgments(self, concept_id: str) -> List[Dict]:
         """
@@ -204,62 +414,61 @@ class KnowledgeGraph:
         Returns:
             List of judgment nodes
         """
-        judgments = []
-        
-        for edge in self.edges:
-            if edge["target"] == concept_id and edge.get("relationship") == "INTERPRETS":
-                judgment = self.nodes.get(edge["source"])
-                if judgment and judgment.get("type") == "judgment":
-                    judgments.append(judgment)
-        
-        return judgments
+        judgment_ids = self._memoized(
+            ("interpreting", concept_id),
+            lambda: self._neighbours_of_type(self.in_by_rel.get("INTERPRETS", {}), concept_id, "judgment"),
+        )
+        return [self.nodes[node_id] for node_id in judgment_ids]
     
-    def search_nodes(self, query: str, node_type: Optional[str] = None) -> List[Dict]:
+    def search_nodes(
+        self,
+        query: str,
+        node_type: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
         """
         Search nodes by text matching.
         
         Args:
             query: Search query
             node_type: Optional filter by node type (statute, judgment, concept)
+            limit: Optional maximum number of results (best first)
         
         Returns:
             List of matching nodes with scores
         """
         query_lower = query.lower()
+        scored = self._memoized(
+            ("search", query_lower, node_type, limit),
+            lambda: self._search_nodes_impl(query_lower, node_type, limit),
+        )
+        return [{**self.nodes[node_id], "_score": score} for node_id, score in scored]
+    
+    def _search_nodes_impl(
+        self,
+        query_lower: str,
+        node_type: Optional[str],
+        limit: Optional[int]
+    ) -> Tuple[Tuple[str, float], ...]:
+        """Scored (node_id, score) matches, best first."""
         results = []
         
-        for node_id, node in self.nodes.items():
-            if node_type and node.get("type") != node_type:
-                continue
-            
+        # Only nodes of the requested type sharing every trigram with the query can match
+        for node_id in self._candidate_nodes(query_lower, node_type):
+            # Check various fields (id, title, description, summary, name, section)
             score = 0.0
-            
-            # Check various fields
-            if query_lower in node_id.lower():
-                score += 0.5
-            
-            if query_lower in node.get("title", "").lower():
-                score += 0.4
-            
-            if query_lower in node.get("description", "").lower():
-                score += 0.3
-            
-            if query_lower in node.get("summary", "").lower():
-                score += 0.3
-            
-            if query_lower in node.get("name", "").lower():
-                score += 0.4
-            
-            # Check section numbers
-            if node.get("section") and query_lower in str(node.get("section")).lower():
-                score += 0.5
+            for text, weight in self.node_lower[node_id]:
+                if query_lower in text:
+                    score += weight
             
             if score > 0:
-                results.append({**node, "_score": score})
+                results.append((node_id, score))
         
-        # Sort by score
-        results.sort(key=lambda x: x["_score"], reverse=True)
-        return results
+        # Sort by score; with a limit, keep only the best without sorting the rest
+        if limit is not None:
+            return tuple(heapq.nlargest(limit, results, key=lambda x: x[1]))
+        results.sort(key=lambda x: x[1], reverse=True)
+        return tuple(results)
     
     def multi_hop_search(self, start_id: str, max_hops: int = 2) -> Dict[str, Any]:
         """
@@ -272,75 +481,40 @@ class KnowledgeGraph:
         Returns:
             Dictionary with found nodes organized by hop distance
         """
-        if HAS_NETWORKX and self.graph:
-            return self._networkx_multi_hop(start_id, max_hops)
-        
-        return self._simple_multi_hop(start_id, max_hops)
-    
-    def _networkx_multi_hop(self, start_id: str, max_hops: int) -> Dict[str, Any]:
-        """Multi-hop using NetworkX."""
         result = {"start": self.nodes.get(start_id), "hops": {}}
         
-        if start_id not in self.graph:
-            return result
-        
-        for hop in range(1, max_hops + 1):
-            # Get nodes at this hop distance
-            try:
-                paths = nx.single_source_shortest_path_length(
-                    self.graph, start_id, cutoff=hop
-                )
-                nodes_at_hop = [
-                    self.nodes[n] for n, d in paths.items() 
-                    if d == hop and n in self.nodes
-                ]
-                result["hops"][hop] = nodes_at_hop
-            except nx.NetworkXError:
-                break
+        # One breadth-first pass over the adjacency indexes, following edges in
+        # both directions; each node is reported once, at its shortest distance
+        distance = {start_id: 0}
+        queue = deque([start_id])
         
-        return result
-    
-    def _simple_multi_hop(self, start_id: str, max_hops: int) -> Dict[str, Any]:
-        """Simple multi-hop without NetworkX."""
-        result = {"start": self.nodes.get(start_id), "hops": {}}
-        visited = {start_id}
-        current_level = {start_id}
-        
-        for hop in range(1, max_hops + 1):
-            next_level = set()
-            
-            for node_id in current_level:
-                for edge in self.edges:
-                    if edge["source"] == node_id and edge["target"] not in visited:
-                        next_level.add(edge["target"])
-                    if edge["target"] == node_id and edge["source"] not in visited:
-                        next_level.add(edge["source"])
-            
-            if next_level:
-                result["hops"][hop] = [
-                    self.nodes[n] for n in next_level if n in self.nodes
-                ]
-                visited.update(next_level)
-                current_level = next_level
-            else:
+        while queue:
+            node_id = queue.popleft()
+            hop = distance[node_id] + 1
+            if hop > max_hops:
                 break
+            
+            for neighbour in chain(self.out_all.get(node_id, ()), self.in_all.get(node_id, ())):
+                if neighbour in distance:
+                    continue
+                distance[neighbour] = hop
+                queue.append(neighbour)
+                if neighbour in self.nodes:
+                    result["hops"].setdefault(hop, []).append(self.nodes[neighbour])
         
         return result
     
     def get_all_judgments(self) -> List[Dict]:
         """Get all judgment nodes."""
-        return [n for n in self.nodes.values() if n.get("type") == "judgment"]
+        return list(self.nodes_by_type.get("judgment", ()))
     
     def get_all_statutes(self) -> List[Dict]:
         """Get all statute nodes (both old and new)."""
-        return [
-            n for n in self.nodes.values() 
-            if n.get("type") in ["old_statute", "new_statute", "statute_reference"]
-        ]
+        return list(self.statute_nodes)
     
     def get_all_concepts(self) -> List[Dict]:
         """Get all concept nodes."""
-        return [n for n in self.nodes.values() if n.get("type") == "concept"]
+        return list(self.nodes_by_type.get("concept", ()))
 
 
 # Singleton instance
@@ -369,8 +543,8 @@ if __name__ == "__main__":
         print(f"  - {j.get('title')}")
     
     print("\n--- Test: Search 'privacy' ---")
-    results = kg.search_nodes("privacy")
-    for r in results[:3]:
+    results = kg.search_nodes("privacy", limit=3)
+    for r in results:
         print(f"  - {r.get('id')}: {r.get('title', r.get('name', ''))}")
     
     print("\n--- Test: Multi-hop from navtej_johar_2018 ---")
@@ -9,11 +9,12 @@ Provides graph-enhanced RAG capabilities:
 
 import os
 import asyncio
-import json
 from typing import List, Dict, Optional, Any
 from pathlib import Path
 from dotenv import load_dotenv
 
+from .knowledge_graph import load_json
+
 # Load environment variables from .env
 load_dotenv()
 
@@ -26,6 +27,9 @@ except ImportError:
     HAS_LIGHTRAG = False
     print("Warning: LightRAG not installed. Run: pip install lightrag-hku")
 
+# Documents inserted concurrently; bounded to stay under OpenAI rate limits
+MAX_CONCURRENT_INSERTS = int(os.getenv("LIGHTRAG_INDEX_CONCURRENCY", "8"))
+
 
 class LightRAGEngine:
     """
@@ -56,20 +60,25 @@ class LightRAGEngine:
         
         self.rag: Optional[LightRAG] = None
         self.is_initialized = False
-        self.documents: List[Dict] = []
+        self._documents: Optional[List[Dict]] = None  # parsed on first access
         
         # Create working directory
         os.makedirs(self.working_dir, exist_ok=True)
-        
-        # Load documents
-        self._load_documents()
     
-    def _load_documents(self):
+    @property
+    def documents(self) -> List[Dict]:
+        """Judgment documents, parsed on first access rather than at startup."""
+        if self._documents is None:
+            self._documents = self._load_documents()
+        return self._documents
+    
+    def _load_documents(self) -> List[Dict]:
         """Load judgment documents."""
-        if os.path.exists(self.documents_path):
-            with open(self.documents_path, 'r', encoding='utf-8') as f:
-                self.documents = json.load(f)
-            print(f"Loaded {len(self.documents)} documents for LightRAG")
+        if not os.path.exists(self.documents_path):
+            return []
+        documents = load_json(self.documents_path)
+        print(f"Loaded {len(documents)} documents for LightRAG")
+        return documents
     
     async def initialize(self):
         """Initialize LightRAG instance."""
@@ -125,15 +134,21 @@ class LightRAGEngine:
         
         print(f"Indexing {len(self.documents)} documents...")
         
-        for doc in self.documents:
+        # Inserts wait on embedding/LLM calls, so run several at once
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_INSERTS)
+        
+        async def insert(doc: Dict):
             # Prepare document text
             text = self._format_document_for_indexing(doc)
             
-            try:
-                await self.rag.ainsert(text)
-                print(f"  Indexed: {doc.get('doc_id', 'unknown')}")
-            except Exception as e:
-                print(f"  Error indexing {doc.get('doc_id')}: {e}")
+            async with semaphore:
+                try:
+                    await self.rag.ainsert(text)
+                    print(f"  Indexed: {doc.get('doc_id', 'unknown')}")
+                except Exception as e:
+                    print(f"  Error indexing {doc.get('doc_id')}: {e}")
+        
+        await asyncio.gather(*(insert(doc) for doc in self.documents))
         
         # Mark as indexed
         index_marker.write_text("indexed")
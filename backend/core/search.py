@@ -7,13 +7,40 @@ Combines:
 - Score-based ranking
 """
 
-import json
 import os
 import re
-from typing import List, Dict, Optional, Tuple
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from typing import List, Dict, Optional, Set, Tuple
 from pathlib import Path
 
-from .knowledge_graph import get_knowledge_graph, KnowledgeGraph
+import numpy as np
+
+# Aho-Corasick finds all keywords inside a query word in one pass when installed
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+from .knowledge_graph import (
+    get_knowledge_graph,
+    load_json,
+    read_cache,
+    source_signature,
+    write_cache,
+    KnowledgeGraph,
+)
+
+
+# Statute references: IPC 302, Section 377, CrPC 438, 304A IPC, etc.
+# One alternation so the query is scanned once; exactly one section group matches.
+_STATUTE_RE = re.compile(
+    r'(?:IPC|ipc)\s*(?:section)?\s*(?P<sec1>\d+[A-Za-z]?)'
+    r'|(?:section|Section)\s*(?P<sec2>\d+[A-Za-z]?)\s*(?:of\s*)?(?:IPC|ipc)?'
+    r'|(?:CrPC|crpc)\s*(?:section)?\s*(?P<sec3>\d+[A-Za-z]?)'
+    r'|(?P<sec4>\d+[A-Za-z]?)\s*(?:IPC|ipc)'
+)
 
 
 class SearchEngine:
@@ -21,19 +48,27 @@ class SearchEngine:
     Search engine that combines KG and document search.
     """
     
-    def __init__(self, documents_path: Optional[str] = None):
+    POSTINGS_CACHE_SIZE = 4096  # memoized query words per instance
+    
+    def __init__(self, documents_path: Optional[str] = None, cache_path: Optional[str] = None):
         """
         Initialize search engine.
         
         Args:
             documents_path: Path to documents.json
+            cache_path: Pickle of the preprocessed documents (default: next to documents_path)
         """
         base_dir = Path(__file__).parent.parent
         self.documents_path = documents_path or str(base_dir / "data" / "documents.json")
+        self.cache_path = cache_path or str(Path(self.documents_path).with_suffix(".cache.pkl"))
         
         self.documents: List[Dict] = []
         self.kg: KnowledgeGraph = get_knowledge_graph()
         
+        # Per-instance LRU of word -> postings; never pickled, so a reload starts empty
+        self._postings_cache: "OrderedDict[str, Tuple[np.ndarray, ...]]" = OrderedDict()
+        self._postings_cache_lock = threading.Lock()
+        
         self._load_documents()
     
     def _load_documents(self):
@@ -42,10 +77,125 @@ class SearchEngine:
             print(f"Warning: Documents not found at {self.documents_path}")
             return
         
-        with open(self.documents_path, 'r', encoding='utf-8') as f:
-            self.documents = json.load(f)
+        # Reuse tokenized documents and postings while the source is unchanged
+        signature = source_signature([self.documents_path])
+        cached = read_cache(self.cache_path, signature)
+        if cached is not None:
+            self.__dict__.update(cached)
+            print(f"Loaded {len(self.documents)} documents from cache")
+            return
+        
+        self.documents = load_json(self.documents_path)
         
         print(f"Loaded {len(self.documents)} documents")
+        self._prepare_documents()
+        
+        write_cache(self.cache_path, signature, {
+            k: v for k, v in vars(self).items()
+            if k not in ("kg", "documents_path", "cache_path", "_postings_cache", "_postings_cache_lock")
+        })
+    
+    def _prepare_documents(self):
+        """Lowercase searchable fields, count content terms and build postings once."""
+        self._idx_by_doc_id: Dict[str, List[int]] = defaultdict(list)
+        self._trigram_idx: Dict[str, Set[int]] = defaultdict(set)  # title/keyword/statute text
+        self._keyword_idx: Dict[str, Set[int]] = defaultdict(set)  # whole keywords
+        self._content_idx: Dict[str, Set[int]] = defaultdict(set)  # content words
+        self._statute_idx: Dict[str, Set[int]] = defaultdict(set)  # statute tokens ("ipc", "377")
+        
+        for i, doc in enumerate(self.documents):
+            doc["_title_lc"] = doc.get("title", "").lower()
+            doc["_kw_lc"] = [k.lower() for k in doc.get("keywords", [])]
+            doc["_statutes_lc"] = " ".join(doc.get("statutes", [])).lower()
+            doc["_statutes_set"] = frozenset(doc["_statutes_lc"].split())
+            doc["_content_tf"] = Counter(re.findall(r"\w+", doc.get("content", "").lower()))
+            
+            self._idx_by_doc_id[doc.get("doc_id")].append(i)
+            for text in (doc["_title_lc"], doc["_statutes_lc"], *doc["_kw_lc"]):
+                for j in range(len(text) - 2):
+                    self._trigram_idx[text[j:j + 3]].add(i)
+            for kw in doc["_kw_lc"]:
+                self._keyword_idx[kw].add(i)
+            for token in doc["_content_tf"]:
+                self._content_idx[token].add(i)
+            for token in doc["_statutes_set"]:
+                self._statute_idx[token].add(i)
+        
+        self._keyword_automaton = None
+        keywords = [kw for kw in self._keyword_idx if kw]
+        if HAS_AHOCORASICK and keywords:
+            automaton = ahocorasick.Automaton()
+            for kw in keywords:
+                automaton.add_word(kw, kw)
+            automaton.make_automaton()
+            self._keyword_automaton = automaton
+    
+    def _word_postings(self, word: str) -> Tuple[np.ndarray, ...]:
+        """
+        Documents one query word scores against, per field (memoized per word).
+        
+        Returns:
+            (title_idx, keyword_idx, statute_idx, content_idx, content_scores),
+            read-only arrays shared between calls
+        """
+        with self._postings_cache_lock:
+            postings = self._postings_cache.get(word)
+            if postings is not None:
+                self._postings_cache.move_to_end(word)
+                return postings
+        
+        postings = self._compute_word_postings(word)
+        with self._postings_cache_lock:
+            self._postings_cache[word] = postings
+            if len(self._postings_cache) > self.POSTINGS_CACHE_SIZE:
+                self._postings_cache.popitem(last=False)
+        return postings
+    
+    def _compute_word_postings(self, word: str) -> Tuple[np.ndarray, ...]:
+        empty: Set[int] = set()
+        docs = self.documents
+        
+        # Title, keyword or statute text containing the word has all its trigrams
+        postings = sorted(
+            (self._trigram_idx.get(word[j:j + 3], empty) for j in range(len(word) - 2)),
+            key=len,
+        )
+        in_text = postings[0].intersection(*postings[1:])
+        
+        # Keywords contained in the word
+        kw_candidates = in_text | self._keyword_idx.get("", empty)
+        if self._keyword_automaton is not None:
+            for _, kw in self._keyword_automaton.iter(word):
+                kw_candidates |= self._keyword_idx[kw]
+        else:
+            for start in range(len(word)):
+                for end in range(start + 1, len(word) + 1):
+                    kw_candidates |= self._keyword_idx.get(word[start:end], empty)
+        
+        title_idx = [i for i in in_text if word in docs[i]["_title_lc"]]
+        # A whole statute token ("377") is a hash hit; only partial ones need a substring scan
+        statute_hits = self._statute_idx.get(word, empty)
+        statute_idx = list(statute_hits) + [
+            i for i in in_text - statute_hits if word in docs[i]["_statutes_lc"]
+        ]
+        keyword_idx = [
+            i for i in kw_candidates
+            if any(word in kw or kw in word for kw in docs[i]["_kw_lc"])
+        ]
+        content_idx = list(self._content_idx.get(word, empty))
+        # Content match (frequency of the whole word)
+        content_scores = [min(docs[i]["_content_tf"][word] * 0.02, 0.15) for i in content_idx]
+        
+        arrays = (
+            np.array(title_idx, dtype=np.intp),
+            np.array(keyword_idx, dtype=np.intp),
+            np.array(statute_idx, dtype=np.intp),
+            np.array(content_idx, dtype=np.intp),
+            np.array(content_scores, dtype=np.float64),
+        )
+        for array in arrays:
+            array.flags.writeable = False
+        return arrays
     
     def search(self, query: str, top_k: int = 5) -> Dict:
         """
@@ -80,37 +230,26 @@ class SearchEngine:
         """Extract and resolve statute references from query."""
         result = {"mapping": None, "related": []}
         
-        # Pattern: IPC 302, Section 377, etc.
-        patterns = [
-            r'(?:IPC|ipc)\s*(?:section)?\s*(\d+[A-Za-z]?)',
-            r'(?:section|Section)\s*(\d+[A-Za-z]?)\s*(?:of\s*)?(?:IPC|ipc)?',
-            r'(?:CrPC|crpc)\s*(?:section)?\s*(\d+[A-Za-z]?)',
-            r'(\d+[A-Za-z]?)\s*(?:IPC|ipc)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, query)
-            if match:
-                section = match.group(1)
-                
-                # Determine code (default to IPC)
-                code = "IPC"
-                if "crpc" in query.lower():
-                    code = "CrPC"
-                
-                # Get mapping
-                mapping = self.kg.get_statute_mapping(code, section)
-                if mapping:
-                    result["mapping"] = mapping
-                
-                # Find judgments citing this statute
-                citing_judgments = self.kg.find_judgments_citing_statute(code, section)
-                result["related"] = [
-                    {"id": j["id"], "title": j.get("title", "")}
-                    for j in citing_judgments
-                ]
-                
-                break
+        match = _STATUTE_RE.search(query)
+        if match:
+            section = next(g for g in match.groups() if g is not None)
+            
+            # Determine code (default to IPC)
+            code = "IPC"
+            if "crpc" in query.lower():
+                code = "CrPC"
+            
+            # Get mapping
+            mapping = self.kg.get_statute_mapping(code, section)
+            if mapping:
+                result["mapping"] = mapping
+            
+            # Find judgments citing this statute
+            citing_judgments = self.kg.find_judgments_citing_statute(code, section)
+            result["related"] = [
+                {"id": j["id"], "title": j.get("title", "")}
+                for j in citing_judgments
+            ]
         
         return result
     
@@ -119,10 +258,10 @@ class SearchEngine:
         concepts = []
         
         # Search for concepts in KG
-        concept_results = self.kg.search_nodes(query, node_type="concept")
+        concept_results = self.kg.search_nodes(query, node_type="concept", limit=5)
         concepts = [
             {"id": c["id"], "name": c.get("name", "")}
-            for c in concept_results[:5]
+            for c in concept_results
         ]
         
         # If we found a statute, get related concepts via judgments
@@ -155,59 +294,49 @@ class SearchEngine:
             for j in related:
                 boost_ids.add(j["id"])
         
+        # Resolve boosted judgments to document positions once per query
+        boost_idx = {i for doc_id in boost_ids for i in self._idx_by_doc_id.get(doc_id, ())}
+        
+        # Accumulate every document's score at once from the per-word postings
+        # (each field adds in the same order as a per-document loop would)
+        scores = np.zeros(len(self.documents))
+        for word in query_words:
+            title_idx, keyword_idx, statute_idx, content_idx, content_scores = self._word_postings(word)
+            scores[title_idx] += 0.4       # Title match (highest weight)
+            scores[keyword_idx] += 0.35    # Keyword match
+            scores[statute_idx] += 0.3     # Statute match
+            scores[content_idx] += content_scores
+        
+        # KG boost: if this document is related to query concepts
+        scores[np.fromiter(boost_idx, dtype=np.intp)] += 0.25
+        
+        # Normalize
+        np.minimum(scores, 1.0, out=scores)
+        
+        # Rank by rounded score, ties in load order; only the top k are sorted
+        matched = np.flatnonzero(scores > 0)
+        rank_key = -np.rint(scores[matched] * 1000).astype(np.int64) * (len(self.documents) + 1) + matched
+        if 0 < top_k < len(matched):
+            selected = np.argpartition(rank_key, top_k - 1)[:top_k]
+            order = matched[selected[np.argsort(rank_key[selected])]]
+        else:
+            order = matched[np.argsort(rank_key)][:top_k]
+        
         scored_docs = []
+        for i in order:
+            doc = self.documents[i]
+            scored_docs.append({
+                "doc_id": doc.get("doc_id", ""),
+                "title": doc.get("title", ""),
+                "content": doc.get("content", "")[:500],
+                "score": round(float(scores[i]), 3),
+                "year": doc.get("year"),
+                "court": doc.get("court", ""),
+                "statutes": doc.get("statutes", []),
+                "keywords": doc.get("keywords", [])
+            })
         
-        for doc in self.documents:
-            score = 0.0
-            
-            title = doc.get("title", "").lower()
-            content = doc.get("content", "").lower()
-            keywords = [k.lower() for k in doc.get("keywords", [])]
-            statutes = " ".join(doc.get("statutes", [])).lower()
-            
-            for word in query_words:
-                # Title match (highest weight)
-                if word in title:
-                    score += 0.4
-                
-                # Keyword match
-                for kw in keywords:
-                    if word in kw or kw in word:
-                        score += 0.35
-                        break
-                
-                # Statute match
-                if word in statutes:
-                    score += 0.3
-                
-                # Content match (frequency-based)
-                word_count = content.count(word)
-                if word_count > 0:
-                    score += min(word_count * 0.02, 0.15)
-            
-            # KG boost: if this document is related to query concepts
-            if doc.get("doc_id") in boost_ids:
-                score += 0.25
-            
-            # Normalize
-            score = min(score, 1.0)
-            
-            if score > 0:
-                scored_docs.append({
-                    "doc_id": doc.get("doc_id", ""),
-                    "title": doc.get("title", ""),
-                    "content": doc.get("content", "")[:500],
-                    "score": round(score, 3),
-                    "year": doc.get("year"),
-                    "court": doc.get("court", ""),
-                    "statutes": doc.get("statutes", []),
-                    "keywords": doc.get("keywords", [])
-                })
-        
-        # Sort by score
-        scored_docs.sort(key=lambda x: x["score"], reverse=True)
-        
-        return scored_docs[:top_k]
+        return scored_docs
 
 
 # Singleton
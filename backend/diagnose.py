@@ -13,6 +13,8 @@ import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
+from settings import get_settings
+
 # Load environment variables
 load_dotenv()
 
@@ -49,8 +51,9 @@ def check_qdrant():
     print("\n[2] QDRANT CLOUD")
     print("-" * 40)
     
-    cloud_url = os.getenv("QDRANT_CLOUD_URL")
-    api_key = os.getenv("QDRANT_API_KEY")
+    settings = get_settings()
+    cloud_url = settings.qdrant_cloud_url
+    api_key = settings.qdrant_api_key
     
     if not cloud_url or not api_key:
         print("  [X] Missing Qdrant credentials")
@@ -60,7 +63,7 @@ def check_qdrant():
         from qdrant_client import QdrantClient
         
         print(f"  Connecting to {cloud_url[:50]}...")
-        client = QdrantClient(url=cloud_url, api_key=api_key)
+        client = QdrantClient(url=cloud_url, api_key=api_key, prefer_grpc=True)
         
         # List collections
         collections = client.get_collections()
@@ -74,7 +77,7 @@ def check_qdrant():
             # Test search (without embedding)
             from pipeline.embeddings import EmbeddingService
             print("  Loading embedding model...")
-            service = EmbeddingService(cloud_url=cloud_url, api_key=api_key)
+            service = EmbeddingService(cloud_url=cloud_url, api_key=api_key, warmup=True)
             
             print("  Searching for 'medical negligence'...")
             results = service.search("medical negligence", top_k=3)
@@ -96,9 +99,10 @@ def check_neo4j():
     print("\n[3] NEO4J")
     print("-" * 40)
     
-    uri = os.getenv("NEO4J_URI")
-    user = os.getenv("NEO4J_USER")
-    password = os.getenv("NEO4J_PASSWORD")
+    settings = get_settings()
+    uri = settings.neo4j_uri
+    user = settings.neo4j_user
+    password = settings.neo4j_password
     
     if not uri or not password:
         print("  [X] Missing Neo4j credentials")
@@ -135,7 +139,7 @@ def check_openai():
     print("\n[4] OPENAI LLM")
     print("-" * 40)
     
-    api_key = os.getenv("OPENAI_API_KEY")
+    api_key = get_settings().openai_api_key
     
     if not api_key or api_key.startswith("YOUR_"):
         print("  [X] OpenAI API key not set")
@@ -172,28 +176,29 @@ def check_api_endpoint():
         
         base_url = "http://127.0.0.1:8000"
         
-        # First login
-        print("  Logging in...")
-        login_resp = httpx.post(f"{base_url}/login", json={
-            "username": "practitioner_demo",
-            "password": "demo123"
-        })
-        
-        if login_resp.status_code != 200:
-            print(f"  [X] Login failed: {login_resp.status_code}")
-            return False
-        
-        token = login_resp.json()["access_token"]
-        print(f"  [OK] Got token: {token[:20]}...")
-        
-        # Now search
-        print("  Searching via API...")
-        search_resp = httpx.post(
-            f"{base_url}/search",
-            json={"query": "medical negligence", "top_k": 5},
-            headers={"Authorization": f"Bearer {token}"},
-            timeout=60.0
-        )
+        # One keep-alive connection shared by the login and search requests
+        with httpx.Client(base_url=base_url, timeout=60.0) as client:
+            # First login
+            print("  Logging in...")
+            login_resp = client.post("/login", json={
+                "username": "practitioner_demo",
+                "password": "demo123"
+            })
+            
+            if login_resp.status_code != 200:
+                print(f"  [X] Login failed: {login_resp.status_code}")
+                return False
+            
+            token = login_resp.json()["access_token"]
+            print(f"  [OK] Got token: {token[:20]}...")
+            
+            # Now search
+            print("  Searching via API...")
+            search_resp = client.post(
+                "/search",
+                json={"query": "medical negligence", "top_k": 5},
+                headers={"Authorization": f"Bearer {token}"},
+            )
         
         if search_resp.status_code != 200:
             print(f"  [X] Search failed: {search_resp.status_code}")
@@ -5,10 +5,19 @@ Uses the OpenAI API for the prototype. Later, swap to local_stub.py for
 offline Llama 3.x inference.
 """
 
-import os
 from typing import Optional, Generator
+import httpx
 from openai import OpenAI
 
+from settings import get_settings
+
+# HTTP/2 needs the optional h2 package
+try:
+    import h2  # noqa: F401
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
 
 class OnlineLLMClient:
     """Wrapper for OpenAI API calls."""
@@ -28,8 +37,16 @@ IMPORTANT RULES:
 """
     
     def __init__(self, api_key: Optional[str] = None):
-        self.api_key = api_key or os.getenv("OPENAI_API_KEY", "YOUR_OPENAI_API_KEY")
-        self.client = OpenAI(api_key=self.api_key)
+        self.api_key = api_key or get_settings().openai_api_key or "YOUR_OPENAI_API_KEY"
+        # Pooled keep-alive transport: later calls reuse the TLS connection
+        self.client = OpenAI(
+            api_key=self.api_key,
+            http_client=httpx.Client(
+                http2=HAS_H2,
+                timeout=60.0,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            ),
+        )
         self.model = "gpt-4o-mini"
     
     def generate(
@@ -90,7 +107,19 @@ Provide a well-structured answer with citations from the context."""
                 yield chunk.choices[0].delta.content
 
 
+# Singleton instance
+_online_client: Optional[OnlineLLMClient] = None
+
+
+def get_online_llm_client() -> OnlineLLMClient:
+    """Get or create the shared OpenAI client (one connection pool per process)."""
+    global _online_client
+    if _online_client is None:
+        _online_client = OnlineLLMClient()
+    return _online_client
+
+
 if __name__ == "__main__":
-    client = OnlineLLMClient()
+    client = get_online_llm_client()
     print("Online LLM client initialized.")
     print(f"Using model: {client.model}")
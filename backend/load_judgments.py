@@ -2,8 +2,10 @@
 load_judgments.py - Load judgment PDFs into Qdrant.
 """
 
+import asyncio
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -13,9 +15,116 @@ load_dotenv()
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from pipeline.ingest import load_documents, extract_text_from_pdf
+from pipeline.ingest import extract_text_from_pdf
 from pipeline.embeddings import EmbeddingService
 
+QUEUE_SIZE = 128      # extracted documents waiting to be embedded
+EMBED_BATCH_SIZE = 32
+BATCH_WAIT_SECONDS = 0.5  # embed a partial batch if the queue stays empty this long
+MAX_CHARS = 10000     # truncate very long documents for embedding
+
+
+def _extract_pdf(pdf_path: str):
+    """Extract one PDF in a worker process, returning (content, error)."""
+    try:
+        return extract_text_from_pdf(pdf_path), None
+    except Exception as e:
+        return None, str(e)
+
+
+async def _extract_all(pdf_files: list, queue: asyncio.Queue, executor: ProcessPoolExecutor) -> None:
+    """Producer: extract PDFs in the process pool and queue them in input order."""
+    loop = asyncio.get_running_loop()
+    futures = [loop.run_in_executor(executor, _extract_pdf, str(p)) for p in pdf_files]
+    
+    for i, (pdf_path, future) in enumerate(zip(pdf_files, futures)):
+        content, error = await future
+        print(f"    [{i+1}/{len(pdf_files)}] Processing {pdf_path.name}...")
+        if error is not None:
+            print(f"        [ERROR] Failed: {error}")
+            continue
+        
+        if len(content) > MAX_CHARS:
+            content = content[:MAX_CHARS] + "...[truncated]"
+        
+        await queue.put({
+            "id": pdf_path.stem,
+            "filename": pdf_path.name,
+            "content": content,
+            "source_type": ".pdf"
+        })
+        print(f"        Extracted {len(content)} chars")
+    
+    # End-of-stream marker
+    await queue.put(None)
+
+
+async def _embed_and_upload(queue: asyncio.Queue, embedding_service: EmbeddingService) -> int:
+    """
+    Consumer: embed queued documents in batches and upsert them concurrently.
+    
+    Each batch is held back until the next one is encoded, so the final batch
+    can be sent with wait=True as a barrier: everything is searchable on return.
+    """
+    uploads = []
+    held = None
+    count = 0
+    done = False
+    
+    while not done:
+        batch = []
+        while len(batch) < EMBED_BATCH_SIZE:
+            try:
+                doc = await asyncio.wait_for(queue.get(), timeout=BATCH_WAIT_SECONDS)
+            except asyncio.TimeoutError:
+                if batch:
+                    break
+                continue
+            if doc is None:
+                done = True
+                break
+            batch.append(doc)
+        
+        if not batch:
+            continue
+        
+        # Encoding is CPU/GPU-bound; run it off the loop so extraction keeps feeding
+        embeddings = await asyncio.to_thread(
+            embedding_service.encode_documents, batch, EMBED_BATCH_SIZE
+        )
+        if held is not None:
+            uploads.append(asyncio.create_task(embedding_service.aupsert(held)))
+        held = embedding_service.build_points(batch, embeddings, start=count)
+        count += len(batch)
+        print(f"[Embeddings] Encoded {count} documents")
+    
+    await asyncio.gather(*uploads)
+    if held is not None:
+        await embedding_service.aupsert(held, wait=True)
+    return count
+
+
+async def load_pdfs(pdf_files: list, embedding_service: EmbeddingService) -> int:
+    """Extract, embed and upload PDFs with the three stages overlapped."""
+    queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    executor = ProcessPoolExecutor(max_workers=os.cpu_count())
+    producer = asyncio.create_task(_extract_all(pdf_files, queue, executor))
+    consumer = asyncio.create_task(_embed_and_upload(queue, embedding_service))
+    
+    try:
+        # If either stage fails, cancel the other so it can't block on the queue forever
+        done, pending = await asyncio.wait({producer, consumer}, return_when=asyncio.FIRST_EXCEPTION)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            if task.exception() is not None:
+                raise task.exception()
+        return consumer.result()
+    finally:
+        # shutdown(wait=True) joins the workers; keep that off the event loop
+        await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
 
 def main():
     print("=" * 60)
@@ -34,7 +143,7 @@ def main():
     )
     print("[OK] Connected!")
     
-    print("\n[2/3] Loading judgment PDFs...")
+    print("\n[2/3] Locating judgment PDFs...")
     
     # Check multiple possible locations for judgment PDFs
     possible_paths = [
@@ -56,38 +165,17 @@ def main():
     
     print(f"[OK] Found judgments at: {judgments_dir}")
     
-    # Load PDFs
-    documents = []
     pdf_files = list(judgments_dir.glob("*.pdf"))
     print(f"[OK] Found {len(pdf_files)} PDF files")
     
-    for i, pdf_path in enumerate(pdf_files):
-        print(f"    [{i+1}/{len(pdf_files)}] Processing {pdf_path.name}...")
-        try:
-            content = extract_text_from_pdf(str(pdf_path))
-            # Truncate very long documents to first 10000 chars for embedding
-            if len(content) > 10000:
-                content = content[:10000] + "...[truncated]"
-            
-            documents.append({
-                "id": pdf_path.stem,
-                "filename": pdf_path.name,
-                "content": content,
-                "source_type": ".pdf"
-            })
-            print(f"        Extracted {len(content)} chars")
-        except Exception as e:
-            print(f"        [ERROR] Failed: {e}")
-    
-    if not documents:
+    print("\n[3/3] Extracting, embedding and uploading...")
+    count = asyncio.run(load_pdfs(pdf_files, embedding_service))
+    
+    if not count:
         print("[ERROR] No documents loaded!")
         return
     
-    print(f"\n[OK] Loaded {len(documents)} documents")
-    
-    print("\n[3/3] Generating embeddings and uploading...")
-    embedding_service.embed_documents(documents)
-    print(f"[OK] Uploaded {len(documents)} documents to Qdrant Cloud!")
+    print(f"[OK] Uploaded {count} documents to Qdrant Cloud!")
     
     print("\n[TEST] Searching for 'medical negligence'...")
     results = embedding_service.search("medical negligence", top_k=3)
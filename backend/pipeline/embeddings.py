@@ -10,21 +10,148 @@ BGE-M3 Rationale:
 4. **Dense + Sparse**: Supports both dense and sparse embeddings for hybrid search.
 """
 
+import asyncio
 import os
+import threading
 from typing import Optional
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
+import numpy as np
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.models import (
+    Distance,
+    VectorParams,
+    PointStruct,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    QuantizationSearchParams,
+)
 
 # Use sentence-transformers for easy BGE-M3 loading
 # Alternative: from FlagEmbedding import BGEM3FlagModel
+import torch
 from sentence_transformers import SentenceTransformer
 
+# Run on the GPU when one is present; FP16 weights there double encode throughput
+EMBEDDING_DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+
+# Inference backend: "torch" (default), "onnx" for ONNX Runtime on CPU hosts,
+# "openvino" for Intel CPUs, or "ct2" for a CTranslate2 INT8 encoder.
+# The ONNX/OpenVINO graphs are exported on first load and cached (needs
+# sentence-transformers[onnx] or [openvino]); pooling and normalization match torch.
+# EMBEDDING_ONNX_FILE picks a specific export, e.g. an INT8-quantized
+# "onnx/model_qint8_avx512_vnni.onnx".
+# EMBEDDING_CT2_DIR is the converted model, created once with:
+#   ct2-transformers-converter --model BAAI/bge-m3 --quantization int8 --output_dir models/bge-m3-ct2
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE")
+EMBEDDING_CT2_DIR = os.getenv("EMBEDDING_CT2_DIR", "models/bge-m3-ct2")
+EMBEDDING_CT2_POOLING = os.getenv("EMBEDDING_CT2_POOLING", "cls")  # "cls" (BGE) or "mean" (MiniLM)
+# Torch backend on CPU: opt-in dynamic INT8 quantization of the Linear layers
+# (VNNI/AMX GEMMs, ~half the RAM). INT8 query vectors drift from FP32 ones, so
+# re-embed the collection with the same setting before turning it on.
+EMBEDDING_CPU_INT8 = os.getenv("EMBEDDING_CPU_INT8", "0") == "1"
+
+
+class CT2Encoder:
+    """
+    CTranslate2 INT8 encoder with a SentenceTransformer-style encode().
+    
+    Requires the optional `ctranslate2` and `transformers` packages.
+    """
+    
+    def __init__(self, model_dir: str, tokenizer_name: str, pooling: str = "cls", max_length: int = 512):
+        import ctranslate2
+        from transformers import AutoTokenizer
+        
+        self.encoder = ctranslate2.Encoder(model_dir, device="cpu", compute_type="int8")
+        self.tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+        self.pooling = pooling
+        self.max_length = max_length
+    
+    def encode(
+        self, sentences, batch_size: int = 32, normalize_embeddings: bool = False, **kwargs
+    ) -> np.ndarray:
+        single = isinstance(sentences, str)
+        batch = [sentences] if single else list(sentences)
+        
+        if len(batch) > batch_size:
+            return np.concatenate([
+                self.encode(batch[i:i + batch_size], batch_size, normalize_embeddings)
+                for i in range(0, len(batch), batch_size)
+            ])
+        
+        input_ids = self.tokenizer(batch, truncation=True, max_length=self.max_length)["input_ids"]
+        tokens = [self.tokenizer.convert_ids_to_tokens(ids) for ids in input_ids]
+        hidden = np.array(self.encoder.forward_batch(tokens).last_hidden_state, dtype=np.float32)
+        
+        if self.pooling == "mean":
+            lengths = np.array([len(t) for t in tokens])
+            mask = (np.arange(hidden.shape[1])[None, :] < lengths[:, None]).astype(np.float32)
+            pooled = np.einsum("bld,bl->bd", hidden, mask) / lengths[:, None]
+        else:
+            pooled = hidden[:, 0]
+        
+        if normalize_embeddings:
+            pooled /= np.linalg.norm(pooled, axis=1, keepdims=True)
+        return pooled[0] if single else pooled
+
+# Loaded models shared by every EmbeddingService in the process
+_MODEL_CACHE: dict[tuple[str, str], SentenceTransformer] = {}
+_MODEL_LOCK = threading.Lock()
+
+
+def get_embedding_model(model_name: str, backend: str = None) -> SentenceTransformer:
+    """Load a SentenceTransformer once per (model, backend) and reuse it."""
+    backend = backend or EMBEDDING_BACKEND
+    key = (model_name, backend)
+    
+    with _MODEL_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is None:
+            print(f"[Embeddings] Loading model {model_name} ({backend}, {EMBEDDING_DEVICE})...")
+            if backend == "ct2":
+                model = CT2Encoder(EMBEDDING_CT2_DIR, model_name, pooling=EMBEDDING_CT2_POOLING)
+            elif backend == "onnx":
+                model_kwargs = {"provider": "CPUExecutionProvider"}
+                if EMBEDDING_ONNX_FILE:
+                    model_kwargs["file_name"] = EMBEDDING_ONNX_FILE
+                model = SentenceTransformer(model_name, backend="onnx", model_kwargs=model_kwargs)
+            elif backend == "openvino":
+                model = SentenceTransformer(model_name, backend="openvino")
+            else:
+                model = SentenceTransformer(model_name, device=EMBEDDING_DEVICE)
+                if EMBEDDING_DEVICE == "cuda":
+                    model = model.half()
+                elif EMBEDDING_CPU_INT8:
+                    model[0].auto_model = torch.ao.quantization.quantize_dynamic(
+                        model[0].auto_model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                    print("[Embeddings] Quantized Linear layers to INT8")
+            _MODEL_CACHE[key] = model
+            print(f"[Embeddings] Model loaded successfully")
+        return model
+
 
 class EmbeddingService:
     """Service for generating embeddings and storing in Qdrant."""
     
     COLLECTION_NAME = "legal_documents"
     EMBEDDING_DIM = 1024  # BGE-M3 dimension
+    PREVIEW_CHARS = 500
+    UPSERT_BATCH_SIZE = 64  # points per Qdrant upsert request
+    # Only these payload fields come back with a hit; never full document text
+    RESULT_PAYLOAD_FIELDS = ["doc_id", "filename", "source_type", "content_preview"]
+    
+    # INT8 vectors kept in RAM (4x smaller than FP32); originals stay on disk
+    QUANTIZATION = ScalarQuantization(
+        scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+    )
+    # Search the INT8 index with 2x candidates, then rescore those in FP32
+    SEARCH_PARAMS = SearchParams(
+        hnsw_ef=128,
+        quantization=QuantizationSearchParams(ignore=False, rescore=True, oversampling=2.0),
+    )
     
     def __init__(
         self,
@@ -35,11 +162,18 @@ class EmbeddingService:
         persist_path: str = None,  # Path to persist data locally
         cloud_url: str = None,     # Qdrant Cloud URL
         api_key: str = None,       # Qdrant Cloud API key
+        backend: str = None,       # "torch", "onnx", "openvino" or "ct2" (default: EMBEDDING_BACKEND)
+        warmup: bool = False,      # Touch model + collection before first query
+        prefer_grpc: bool = True,  # gRPC (HTTP/2, binary) to a remote Qdrant
     ):
+        # Async client for remote modes (asearch); local modes share one on-disk lock
+        self.aqdrant: Optional[AsyncQdrantClient] = None
+        
         # Initialize Qdrant client
         if cloud_url and api_key:
             # Qdrant Cloud mode
-            self.qdrant = QdrantClient(url=cloud_url, api_key=api_key)
+            self.qdrant = QdrantClient(url=cloud_url, api_key=api_key, prefer_grpc=prefer_grpc)
+            self.aqdrant = AsyncQdrantClient(url=cloud_url, api_key=api_key, prefer_grpc=prefer_grpc)
             print(f"[Qdrant] Connected to Qdrant Cloud")
         elif use_memory:
             # In-memory mode - no server needed, data lost on restart
@@ -52,8 +186,9 @@ class EmbeddingService:
         else:
             # Server mode - requires Qdrant server running
             try:
-                self.qdrant = QdrantClient(host=qdrant_host, port=qdrant_port)
+                self.qdrant = QdrantClient(host=qdrant_host, port=qdrant_port, prefer_grpc=prefer_grpc)
                 self.qdrant.get_collections()  # Test connection
+                self.aqdrant = AsyncQdrantClient(host=qdrant_host, port=qdrant_port, prefer_grpc=prefer_grpc)
                 print(f"[Qdrant] Connected to server at {qdrant_host}:{qdrant_port}")
             except Exception as e:
                 print(f"[Qdrant] Server not available, falling back to local mode")
@@ -61,12 +196,13 @@ class EmbeddingService:
                 self.qdrant = QdrantClient(path=persist_path)
                 print(f"[Qdrant] Running in LOCAL mode (data saved to {persist_path})")
         
-        # Load embedding model
-        print(f"[Embeddings] Loading model {model_name}...")
-        self.model = SentenceTransformer(model_name)
-        print(f"[Embeddings] Model loaded successfully")
+        # Load embedding model (cached across instances)
+        self.model = get_embedding_model(model_name, backend)
         
         self._ensure_collection()
+        
+        if warmup:
+            self.warmup()
     
     def _ensure_collection(self):
         """Create the collection if it doesn't exist."""
@@ -78,48 +214,132 @@ class EmbeddingService:
                     size=self.EMBEDDING_DIM,
                     distance=Distance.COSINE,
                 ),
+                quantization_config=self.QUANTIZATION,
             )
             print(f"[Qdrant] Created collection '{self.COLLECTION_NAME}'")
     
+    def warmup(self) -> None:
+        """
+        Run one throwaway encode and search so the first real query is warm.
+        
+        Qdrant serves vectors and HNSW links from mmapped segments; a probe
+        search pulls the entry points into the page cache after a cold start.
+        """
+        try:
+            collection = self.qdrant.get_collection(self.COLLECTION_NAME)
+            self.vector_size = collection.config.params.vectors.size
+            probe = self.embed_query("warmup")
+            self.qdrant.query_points(
+                collection_name=self.COLLECTION_NAME,
+                query=probe,
+                limit=1,
+            )
+            print(f"[Embeddings] Warm-up done (vector size {self.vector_size})")
+        except Exception as e:
+            print(f"[Embeddings] Warm-up skipped: {e}")
+    
+    def embed_query(self, text: str) -> np.ndarray:
+        """Embedding as a float32 array; the Qdrant client packs it without boxing each float."""
+        with torch.inference_mode():
+            embedding = self.model.encode(text, convert_to_numpy=True, normalize_embeddings=True)
+        return embedding.astype(np.float32, copy=False)
+    
     def embed_text(self, text: str) -> list[float]:
         """Generate embedding for a single text."""
-        return self.model.encode(text, normalize_embeddings=True).tolist()
-    
-    def embed_documents(self, documents: list[dict]) -> None:
-        """Embed and upsert documents into Qdrant."""
-        points = []
-        for i, doc in enumerate(documents):
-            embedding = self.embed_text(doc["content"])
-            point = PointStruct(
+        return self.embed_query(text).tolist()
+    
+    def encode_documents(self, documents: list[dict], batch_size: int = 32) -> np.ndarray:
+        """Normalized float32 embeddings of each document's content."""
+        with torch.inference_mode():
+            embeddings = self.model.encode(
+                [doc["content"] for doc in documents],
+                batch_size=batch_size,
+                normalize_embeddings=True,
+                convert_to_numpy=True,
+            )
+        return embeddings.astype(np.float32, copy=False)
+    
+    def build_points(self, documents: list[dict], embeddings: np.ndarray, start: int = 0) -> list[PointStruct]:
+        """Qdrant points for documents, numbered from start."""
+        return [
+            PointStruct(
                 id=i,
-                vector=embedding,
+                vector=embedding.tolist(),
                 payload={
                     "doc_id": doc["id"],
                     "filename": doc["filename"],
                     "source_type": doc["source_type"],
-                    "content_preview": doc["content"][:500],
+                    "content_preview": doc["content"][:self.PREVIEW_CHARS],
                 },
             )
-            points.append(point)
+            for i, (doc, embedding) in enumerate(zip(documents, embeddings), start=start)
+        ]
+    
+    def embed_documents(self, documents: list[dict], batch_size: int = 32) -> None:
+        """
+        Embed documents in batches and upsert them into Qdrant chunk by chunk.
         
-        self.qdrant.upsert(collection_name=self.COLLECTION_NAME, points=points)
+        Each chunk of UPSERT_BATCH_SIZE documents is encoded (batch_size per
+        forward pass) and sent before the next is encoded, so only one chunk of
+        vectors is held in memory. Intermediate upserts don't wait for indexing;
+        the last one does, so all points are searchable on return.
+        """
+        for start in range(0, len(documents), self.UPSERT_BATCH_SIZE):
+            chunk = documents[start:start + self.UPSERT_BATCH_SIZE]
+            points = self.build_points(chunk, self.encode_documents(chunk, batch_size), start)
+            
+            is_last = start + self.UPSERT_BATCH_SIZE >= len(documents)
+            self.qdrant.upsert(collection_name=self.COLLECTION_NAME, points=points, wait=is_last)
+            print(f"[Embeddings] Upserted {start + len(chunk)}/{len(documents)} documents")
+    
+    async def aupsert(self, points: list[PointStruct], wait: bool = False) -> None:
+        """Upsert without blocking the event loop."""
+        if self.aqdrant is None:
+            await asyncio.to_thread(
+                self.qdrant.upsert, collection_name=self.COLLECTION_NAME, points=points, wait=wait
+            )
+            return
+        await self.aqdrant.upsert(collection_name=self.COLLECTION_NAME, points=points, wait=wait)
     
     def search(self, query: str, top_k: int = 10) -> list[dict]:
         """Search for similar documents."""
-        query_vector = self.embed_text(query)
+        query_vector = self.embed_query(query)
         # Use query method (new API) instead of search (deprecated)
         results = self.qdrant.query_points(
             collection_name=self.COLLECTION_NAME,
             query=query_vector,
             limit=top_k,
+            search_params=self.SEARCH_PARAMS,
+            with_payload=self.RESULT_PAYLOAD_FIELDS,
+        )
+        return self._format_hits(results.points)
+    
+    async def asearch(self, query: str, top_k: int = 10) -> list[dict]:
+        """Search without blocking the event loop (for async endpoints)."""
+        if self.aqdrant is None:
+            return await asyncio.to_thread(self.search, query, top_k)
+        
+        # Encoding is CPU-bound; the Qdrant round trip is awaited on the loop
+        query_vector = await asyncio.to_thread(self.embed_query, query)
+        results = await self.aqdrant.query_points(
+            collection_name=self.COLLECTION_NAME,
+            query=query_vector,
+            limit=top_k,
+            search_params=self.SEARCH_PARAMS,
+            with_payload=self.RESULT_PAYLOAD_FIELDS,
         )
+        return self._format_hits(results.points)
+    
+    @staticmethod
+    def _format_hits(points) -> list[dict]:
+        """Scored points as plain dicts."""
         return [
             {
                 "id": hit.id,
                 "score": hit.score,
                 "payload": hit.payload,
             }
-            for hit in results.points
+            for hit in points
         ]
 
 
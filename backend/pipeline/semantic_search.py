@@ -10,8 +10,10 @@ This provides a complete semantic search solution:
 No heavy ML dependencies on server! Just API calls.
 """
 
+import asyncio
 import json
 import os
+from collections import OrderedDict
 import numpy as np
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
@@ -19,6 +21,14 @@ from dataclasses import dataclass, asdict
 import httpx
 
 
+def _hamming_distances(codes: np.ndarray, query_code: np.ndarray) -> np.ndarray:
+    """Hamming distance from each packed bit row in `codes` to `query_code`."""
+    xor = np.bitwise_xor(codes, query_code)
+    if hasattr(np, "bitwise_count"):  # NumPy 2.0+: hardware popcount
+        return np.bitwise_count(xor).sum(axis=1, dtype=np.int32)
+    return np.unpackbits(xor, axis=1).sum(axis=1, dtype=np.int32)
+
+
 @dataclass
 class SearchResult:
     doc_id: str
@@ -42,6 +52,16 @@ class SemanticSearchEngine:
     """
     
     EMBEDDING_DIM = 1536  # OpenAI text-embedding-3-small dimension
+    QUERY_EMBEDDING_CACHE_SIZE = 512
+    PREVIEW_CHARS = 500
+    # Concurrent queries arriving within this window share one embeddings call
+    EMBED_BATCH_WINDOW = 0.005  # seconds
+    EMBED_MAX_BATCH = 64
+    # Binary prefilter keeps this many candidates per requested result for exact
+    # rescoring; below BINARY_PREFILTER_MIN_DOCS exact scoring is already cheap,
+    # so every document is scored and no true neighbour can be dropped
+    BINARY_OVERSAMPLING = 16
+    BINARY_PREFILTER_MIN_DOCS = 5000
     
     def __init__(self, data_dir: str = None):
         if data_dir is None:
@@ -52,6 +72,12 @@ class SemanticSearchEngine:
         self.documents = []
         self.embeddings = None
         self.openai_key = os.getenv("OPENAI_API_KEY", "")
+        # Recent query embeddings, so callers can reuse the vector search already paid for
+        self._query_embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        # Micro-batching state: queued (text, future) pairs and the pending flush
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: set = set()
         
         # Load pre-computed data
         self._load_data()
@@ -69,9 +95,21 @@ class SemanticSearchEngine:
         else:
             self._create_sample_documents()
         
+        # Results only carry a preview; slice it once instead of per hit
+        self._previews = {
+            doc["doc_id"]: doc.get("content", "")[:self.PREVIEW_CHARS]
+            for doc in self.documents
+        }
+        
         # Load pre-computed embeddings
         if embeddings_file.exists():
-            self.embeddings = np.load(embeddings_file)
+            # Stored as float16 on disk; upcast once so the dot products run in BLAS
+            # (NumPy has no BLAS path for float16), and L2-normalize once so a
+            # query is a single matrix-vector product
+            self.embeddings = np.load(embeddings_file).astype(np.float32)
+            self.embeddings /= np.linalg.norm(self.embeddings, axis=1, keepdims=True).clip(1e-12)
+            # Sign bits of each embedding, packed 8 per byte (32x smaller than float32)
+            self._doc_codes = np.packbits(self.embeddings > 0, axis=1)
             print(f"[Semantic] Loaded embeddings: {self.embeddings.shape}")
         else:
             print("[Semantic] No pre-computed embeddings found. Run build_openai_index.py locally.")
@@ -132,10 +170,62 @@ class SemanticSearchEngine:
             json.dump(self.documents, f, indent=2, ensure_ascii=False)
     
     async def get_embedding(self, text: str) -> Optional[np.ndarray]:
-        """Get embedding for text using OpenAI API."""
+        """
+        Get embedding for text using OpenAI API.
+        
+        Requests are micro-batched: texts queued within EMBED_BATCH_WINDOW
+        (or until EMBED_MAX_BATCH) go out as a single embeddings call.
+        """
         if not self.openai_key:
             return None
         
+        cached = self._query_embeddings.get(text)
+        if cached is not None:
+            self._query_embeddings.move_to_end(text)
+            return cached
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        
+        if len(self._pending) >= self.EMBED_MAX_BATCH:
+            self._flush_pending()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.EMBED_BATCH_WINDOW, self._flush_pending)
+        
+        return await future
+    
+    def cached_embedding(self, text: str) -> Optional[np.ndarray]:
+        """Embedding already memoized by get_embedding, or None; never calls the API."""
+        return self._query_embeddings.get(text)
+    
+    def _flush_pending(self):
+        """Send everything queued so far as one batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._embed_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _embed_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        embeddings = await self._request_embeddings(texts)
+        
+        for text, embedding in embeddings.items():
+            self._query_embeddings[text] = embedding
+        while len(self._query_embeddings) > self.QUERY_EMBEDDING_CACHE_SIZE:
+            self._query_embeddings.popitem(last=False)
+        
+        for text, future in batch:
+            if not future.done():
+                future.set_result(embeddings.get(text))
+    
+    async def _request_embeddings(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """One OpenAI embeddings call for several texts; empty dict on failure."""
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.post(
@@ -146,22 +236,24 @@ class SemanticSearchEngine:
                     },
                     json={
                         "model": "text-embedding-3-small",
-                        "input": text
+                        "input": texts
                     },
                     timeout=30.0
                 )
                 
                 if response.status_code == 200:
                     data = response.json()
-                    embedding = np.array(data["data"][0]["embedding"])
-                    return embedding
+                    return {
+                        texts[item["index"]]: np.array(item["embedding"])
+                        for item in data["data"]
+                    }
                 else:
                     print(f"[Semantic] OpenAI API error: {response.status_code}")
-                    return None
+                    return {}
                     
         except Exception as e:
             print(f"[Semantic] Embedding error: {e}")
-            return None
+            return {}
     
     async def search(self, query: str, top_k: int = 5) -> List[SearchResult]:
         """
@@ -180,25 +272,37 @@ class SemanticSearchEngine:
     
     def _vector_search(self, query_embedding: np.ndarray, top_k: int) -> List[SearchResult]:
         """Search using cosine similarity with pre-computed embeddings."""
-        # Normalize
-        query_norm = query_embedding / np.linalg.norm(query_embedding)
-        doc_norms = self.embeddings / np.linalg.norm(self.embeddings, axis=1, keepdims=True)
+        # Normalize (documents were normalized at load)
+        query_norm = (query_embedding / np.linalg.norm(query_embedding)).astype(np.float32)
+        
+        # Coarse pass on sign bits, then exact cosine only for the survivors
+        num_candidates = min(len(self.embeddings), top_k * self.BINARY_OVERSAMPLING)
+        if len(self.embeddings) >= self.BINARY_PREFILTER_MIN_DOCS and num_candidates < len(self.embeddings):
+            distances = _hamming_distances(self._doc_codes, np.packbits(query_norm > 0))
+            candidates = np.argpartition(distances, num_candidates - 1)[:num_candidates]
+        else:
+            candidates = np.arange(len(self.embeddings))
         
         # Compute similarities
-        similarities = np.dot(doc_norms, query_norm)
+        similarities = self.embeddings[candidates] @ query_norm
         
-        # Get top-k indices
-        top_indices = np.argsort(similarities)[::-1][:top_k]
+        # Get top-k indices: partial selection, then sort just those k
+        k = min(top_k, len(similarities))
+        if k <= 0:
+            return []
+        top_positions = np.argpartition(-similarities, k - 1)[:k]
+        top_positions = top_positions[np.argsort(-similarities[top_positions])]
         
         results = []
-        for idx in top_indices:
+        for pos in top_positions:
+            idx = candidates[pos]
             if idx < len(self.documents):
                 doc = self.documents[idx]
                 results.append(SearchResult(
                     doc_id=doc["doc_id"],
                     title=doc.get("title", ""),
-                    content=doc.get("content", "")[:500],
-                    score=float(similarities[idx]),
+                    content=self._previews[doc["doc_id"]],
+                    score=float(similarities[pos]),
                     source="semantic",
                     metadata={
                         "year": doc.get("year"),
@@ -240,7 +344,7 @@ class SemanticSearchEngine:
             results.append(SearchResult(
                 doc_id=doc["doc_id"],
                 title=doc.get("title", ""),
-                content=doc.get("content", "")[:500],
+                content=self._previews[doc["doc_id"]],
                 score=min(score, 1.0),
                 source="keyword",
                 metadata={
@@ -0,0 +1,40 @@
+"""
+settings.py - Environment configuration for Legal Lens.
+
+Variables are read once (after .env is loaded) into a frozen Settings object,
+so request handlers don't re-probe os.environ on every call.
+"""
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from dotenv import load_dotenv
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Credentials and endpoints; None when the variable is unset."""
+    openai_api_key: Optional[str]
+    groq_api_key: Optional[str]
+    qdrant_cloud_url: Optional[str]
+    qdrant_api_key: Optional[str]
+    neo4j_uri: Optional[str]
+    neo4j_user: Optional[str]
+    neo4j_password: Optional[str]
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Read the environment once and reuse the result."""
+    load_dotenv()
+    return Settings(
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        groq_api_key=os.getenv("GROQ_API_KEY"),
+        qdrant_cloud_url=os.getenv("QDRANT_CLOUD_URL"),
+        qdrant_api_key=os.getenv("QDRANT_API_KEY"),
+        neo4j_uri=os.getenv("NEO4J_URI"),
+        neo4j_user=os.getenv("NEO4J_USER"),
+        neo4j_password=os.getenv("NEO4J_PASSWORD"),
+    )
@@ -67,3 +67,80 @@ class TestAPIIntegration:
         data = response.json()
         assert "results" in data
         assert "llm_response" in data
+    
+    def test_search_stream(self, client, monkeypatch):
+        """Test that the streaming search emits results, token and done events."""
+        from dataclasses import replace
+        from backend.api import main
+        
+        # Settings are read once and cached, so patch the object, not the environment
+        no_llm = replace(main.get_settings(), groq_api_key=None, openai_api_key=None)
+        monkeypatch.setattr(main, "get_settings", lambda: no_llm)
+        login_response = client.post(
+            "/login",
+            json={"username": "student_demo", "password": "demo123"},
+        )
+        token = login_response.json()["access_token"]
+        
+        response = client.post(
+            "/search/stream",
+            json={"query": "medical negligence"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [line[len("event: "):] for line in response.text.splitlines() if line.startswith("event: ")]
+        assert events[0] == "results"
+        assert events[-1] == "done"
+    
+    def test_history_records_search(self, client):
+        """Test that a search shows up at the end of the user's history."""
+        login_response = client.post(
+            "/login",
+            json={"username": "practitioner_demo", "password": "demo123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+        
+        client.post("/search", json={"query": "basic structure doctrine"}, headers=headers)
+        
+        response = client.get("/history?limit=1", headers=headers)
+        assert response.status_code == 200
+        entries = response.json()
+        assert len(entries) == 1
+        assert entries[0]["query"] == "basic structure doctrine"
+    
+    def test_upload_mapping_rejects_invalid_json(self, client):
+        """Test that a malformed mapping upload returns 400."""
+        login_response = client.post(
+            "/login",
+            json={"username": "practitioner_demo", "password": "demo123"},
+        )
+        token = login_response.json()["access_token"]
+        
+        response = client.post(
+            "/admin/mapping",
+            files={"file": ("mapping.json", b"{not json", "application/json")},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 400
+
+
+class TestStatuteResolution:
+    """Tests for statute lookup in the search context."""
+    
+    class FakeKG:
+        def get_mapping(self, code, section):
+            return {"mapping": f"{code} {section} -> new"}
+        
+        def search_statutes(self, query):
+            return [f"{query} <- old"]
+    
+    def test_ipc_takes_precedence_over_bns(self):
+        """Test that a query naming both codes resolves the IPC mapping."""
+        from backend.api.main import _resolve_statute
+        
+        kg = self.FakeKG()
+        
+        assert _resolve_statute(kg, "BNS 103 vs IPC 302") == "\n\nStatute Mapping: IPC 302 -> new"
+        assert _resolve_statute(kg, "bns 103 murder") == "\n\nRelated statute: BNS 103 <- old"
+        assert _resolve_statute(kg, "medical negligence") == ""
@@ -0,0 +1,40 @@
+"""
+Unit tests for the SQLite search history store.
+"""
+
+import json
+
+from backend.api.history import HistoryStore, iso_to_ns, ns_to_iso
+
+
+class TestHistoryStore:
+    """Tests for api/history.py"""
+
+    def test_recent_returns_last_entries_oldest_first(self, tmp_path):
+        """Test that recent() keeps chronological order and honours the limit."""
+        store = HistoryStore(tmp_path / "history.db")
+        for i in range(5):
+            store.add("u1", f"query {i}", f"answer {i}", 1_700_000_000_000_000_000 + i)
+        store.add("u2", "other user", "answer", 1_700_000_000_000_000_000)
+
+        entries = store.recent("u1", limit=2)
+
+        assert [e["query"] for e in entries] == ["query 3", "query 4"]
+        assert entries[0] == {"query": "query 3", "response": "answer 3", "timestamp": 1_700_000_000_000_000_003}
+        store.close()
+
+    def test_import_legacy_files(self, tmp_path):
+        """Test that old JSON and JSON Lines history files are imported and removed."""
+        entry = {"query": "bail", "response": "answer", "timestamp": "2024-01-01T10:30:00.123456"}
+        (tmp_path / "history_u1.json").write_text(json.dumps([entry]), encoding="utf-8")
+        (tmp_path / "history_u2.jsonl").write_text(json.dumps(entry) + "\n", encoding="utf-8")
+
+        store = HistoryStore(tmp_path / "history.db")
+        store.import_legacy_files(tmp_path)
+
+        imported = {**entry, "timestamp": iso_to_ns(entry["timestamp"])}
+        assert store.recent("u1") == [imported]
+        assert store.recent("u2") == [imported]
+        assert ns_to_iso(imported["timestamp"]) == entry["timestamp"]
+        assert not list(tmp_path.glob("history_*.json*"))
+        store.close()
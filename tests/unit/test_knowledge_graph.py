@@ -0,0 +1,95 @@
+"""
+Unit tests for the in-memory legal knowledge graph.
+"""
+
+import json
+import os
+
+import pytest
+
+from backend.core.knowledge_graph import KnowledgeGraph
+
+
+@pytest.fixture
+def kg(tmp_path):
+    """A small KG with one judgment citing and interpreting a statute."""
+    data = {
+        "nodes": [
+            {"id": "IPC_377", "type": "old_statute", "code": "IPC", "section": "377", "description": "Unnatural offences"},
+            {"id": "BNS_0", "type": "new_statute", "code": "BNS", "section": "0", "description": "Omitted"},
+            {"id": "navtej_johar_2018", "type": "judgment", "title": "Navtej Singh Johar vs Union of India", "year": 2018},
+            {"id": "right_to_privacy", "type": "concept", "name": "Right to Privacy"},
+        ],
+        "links": [
+            {"source": "IPC_377", "target": "BNS_0", "relationship": "REPLACED_BY"},
+            {"source": "navtej_johar_2018", "target": "IPC_377", "relationship": "CITES"},
+            {"source": "navtej_johar_2018", "target": "right_to_privacy", "relationship": "INTERPRETS"},
+        ],
+    }
+    kg_path = tmp_path / "knowledge_graph.json"
+    kg_path.write_text(json.dumps(data), encoding="utf-8")
+    return KnowledgeGraph(kg_path=str(kg_path), mapping_path=str(tmp_path / "missing.json"))
+
+
+class TestKnowledgeGraph:
+    """Tests for core/knowledge_graph.py"""
+    
+    def test_edge_queries(self, kg):
+        """Test citing/interpreting lookups follow edges in the right direction."""
+        assert [j["id"] for j in kg.find_judgments_citing_statute("IPC", "377")] == ["navtej_johar_2018"]
+        assert [c["id"] for c in kg.get_related_concepts("navtej_johar_2018")] == ["right_to_privacy"]
+        assert [j["id"] for j in kg.find_related_judgments("right_to_privacy")] == ["navtej_johar_2018"]
+        assert kg.find_judgments_citing_statute("IPC", "302") == []
+    
+    def test_memoized_results_are_not_shared(self, kg):
+        """Test that mutating a returned list doesn't change later results."""
+        kg.find_judgments_citing_statute("IPC", "377").clear()
+        kg.search_nodes("privacy").append({"id": "bogus"})
+        
+        assert [j["id"] for j in kg.find_judgments_citing_statute("IPC", "377")] == ["navtej_johar_2018"]
+        assert [n["id"] for n in kg.search_nodes("privacy")] == ["right_to_privacy"]
+        
+        kg.get_all_judgments().clear()
+        kg.get_all_statutes().clear()
+        assert [j["id"] for j in kg.get_all_judgments()] == ["navtej_johar_2018"]
+        assert len(kg.get_all_statutes()) == 2
+    
+    def test_edge_arrays(self, kg):
+        """Test that edges are stored as index arrays and round-trip to dicts."""
+        assert kg.num_edges == 3
+        assert kg.edge_src.dtype.name == "int32"
+        assert kg.edges[1] == {"source": "navtej_johar_2018", "target": "IPC_377", "relationship": "CITES"}
+    
+    def test_statute_mapping_from_graph(self, kg):
+        """Test that REPLACED_BY edges resolve when no mapping file entry exists."""
+        mapping = kg.get_statute_mapping("IPC", "377")
+        
+        assert mapping["new_code"] == "BNS"
+        assert mapping["new_section"] == "0"
+        assert kg.get_statute_mapping("IPC", "999") is None
+    
+    def test_multi_hop_search(self, kg):
+        """Test that multi-hop groups neighbours by hop distance."""
+        hops = kg.multi_hop_search("right_to_privacy", max_hops=2)["hops"]
+        
+        assert [n["id"] for n in hops[1]] == ["navtej_johar_2018"]
+        assert sorted(n["id"] for n in hops[2]) == ["IPC_377"]
+    
+    def test_search_nodes_matches_substrings(self, kg):
+        """Test that search_nodes keeps substring semantics through the trigram index."""
+        assert [n["id"] for n in kg.search_nodes("privac")] == ["right_to_privacy"]
+        assert [n["id"] for n in kg.search_nodes("377", node_type="old_statute")] == ["IPC_377"]
+        assert kg.search_nodes("privacy", node_type="judgment") == []
+    
+    def test_reload_from_cache(self, kg):
+        """Test that a second load reuses the pickled graph until the source changes."""
+        assert kg.cache_path.endswith("knowledge_graph.cache.pkl")
+        assert os.path.exists(kg.cache_path)
+        
+        cached = KnowledgeGraph(kg_path=kg.kg_path, mapping_path=kg.mapping_path)
+        assert cached.get_statute_mapping("IPC", "377") == kg.get_statute_mapping("IPC", "377")
+        assert cached.search_nodes("privacy") == kg.search_nodes("privacy")
+        
+        with open(kg.kg_path, "w", encoding="utf-8") as f:
+            json.dump({"nodes": [], "links": []}, f)
+        assert KnowledgeGraph(kg_path=kg.kg_path, mapping_path=kg.mapping_path).nodes == {}
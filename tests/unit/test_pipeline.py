@@ -55,3 +55,60 @@ class TestGraphBuilder:
             court="Supreme Court",
         )
         builder.close()
+
+
+class TestSemanticSearch:
+    """Tests for pipeline/semantic_search.py"""
+    
+    async def test_concurrent_embeddings_share_one_request(self, monkeypatch):
+        """Test that concurrent get_embedding calls are micro-batched."""
+        import asyncio
+        import numpy as np
+        from backend.pipeline.semantic_search import SemanticSearchEngine
+        
+        engine = SemanticSearchEngine()
+        engine.openai_key = "test"
+        calls = []
+        
+        async def fake_request(texts):
+            calls.append(texts)
+            return {text: np.full(3, float(len(text))) for text in texts}
+        
+        monkeypatch.setattr(engine, "_request_embeddings", fake_request)
+        
+        vectors = await asyncio.gather(
+            engine.get_embedding("bail"),
+            engine.get_embedding("privacy"),
+            engine.get_embedding("bail"),
+        )
+        
+        assert calls == [["bail", "privacy"]]
+        assert [v[0] for v in vectors] == [4.0, 7.0, 4.0]
+        assert engine.cached_embedding("bail")[0] == 4.0
+        assert engine.cached_embedding("negligence") is None
+        assert len(calls) == 1
+    
+    def test_binary_prefilter_keeps_exact_top_k(self):
+        """Test that the sign-bit prefilter returns the exact top-k on a realistic corpus."""
+        import numpy as np
+        from backend.pipeline.semantic_search import SemanticSearchEngine
+        
+        # Topic-clustered unit vectors, like embeddings of a real corpus
+        rng = np.random.default_rng(0)
+        n, dim = SemanticSearchEngine.BINARY_PREFILTER_MIN_DOCS, 768
+        topics = rng.standard_normal((100, dim)).astype(np.float32)
+        embeddings = topics[rng.integers(0, 100, n)] + 0.8 * rng.standard_normal((n, dim)).astype(np.float32)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        
+        engine = SemanticSearchEngine.__new__(SemanticSearchEngine)
+        engine.documents = [{"doc_id": str(i)} for i in range(n)]
+        engine._previews = {doc["doc_id"]: "" for doc in engine.documents}
+        engine.embeddings = embeddings
+        engine._doc_codes = np.packbits(embeddings > 0, axis=1)
+        
+        for topic in rng.integers(0, 100, 20):
+            query = topics[topic] + 0.8 * rng.standard_normal(dim).astype(np.float32)
+            exact = np.argsort(-(embeddings @ (query / np.linalg.norm(query))))[:10]
+            
+            results = engine._vector_search(query, top_k=10)
+            assert [int(r.doc_id) for r in results] == exact.tolist()
@@ -0,0 +1,41 @@
+"""
+Unit tests for the semantic LLM response cache.
+"""
+
+import numpy as np
+
+from backend.api.response_cache import SemanticResponseCache
+
+
+class TestSemanticResponseCache:
+    """Tests for api/response_cache.py"""
+
+    def test_exact_hit_ignores_case_and_spacing(self):
+        """Test that the same query text hits without an embedding."""
+        cache = SemanticResponseCache()
+        cache.put("Medical negligence", "ctx", "answer")
+
+        assert cache.get("medical   NEGLIGENCE", "ctx") == ("answer", "exact")
+
+    def test_semantic_hit_requires_same_context(self):
+        """Test that paraphrases hit only when the retrieved context matches."""
+        cache = SemanticResponseCache(threshold=0.95)
+        cache.put("doctor negligence liability", "ctx", "answer", np.array([1.0, 0.0, 0.1]))
+        paraphrase = np.array([1.0, 0.02, 0.1])
+
+        assert cache.get("liability of doctors", "ctx", paraphrase) == ("answer", "semantic")
+        assert cache.get("liability of doctors", "other ctx", paraphrase) == (None, None)
+        assert cache.get("privacy", "ctx", np.array([0.0, 1.0, 0.0])) == (None, None)
+
+    def test_lru_eviction_and_ttl(self):
+        """Test that the cache stays bounded and expires old answers."""
+        cache = SemanticResponseCache(max_entries=2)
+        for i in range(3):
+            cache.put(f"q{i}", "ctx", f"a{i}")
+
+        assert len(cache) == 2
+        assert cache.get("q0", "ctx") == (None, None)
+
+        expired = SemanticResponseCache(ttl_seconds=-1)
+        expired.put("q", "ctx", "a")
+        assert expired.get("q", "ctx") == (None, None)
@@ -0,0 +1,127 @@
+"""
+Unit tests for the Vercel serverless API (api/index.py).
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def vercel_api():
+    """Load api/index.py as a module (the api/ folder is not a package)."""
+    path = Path(__file__).parent.parent.parent / "api" / "index.py"
+    spec = importlib.util.spec_from_file_location("vercel_api", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestSemanticKeywordSearch:
+    """Tests for the BM25-backed semantic_keyword_search."""
+
+    def test_title_and_keyword_match_ranks_first(self, vercel_api):
+        """Test that a keyword + content query ranks the matching case first."""
+        results = vercel_api.semantic_keyword_search("medical negligence")
+
+        assert results
+        assert results[0][0]["doc_id"] == "jacob_mathew_2005"
+
+    def test_statute_query(self, vercel_api):
+        """Test that statute tokens are indexed (IPC 377 -> Navtej Johar)."""
+        results = vercel_api.semantic_keyword_search("IPC 377")
+
+        assert results[0][0]["doc_id"] == "navtej_johar_2018"
+
+    def test_scores_are_normalized(self, vercel_api):
+        """Test that scores stay within [0, 1] and are sorted descending."""
+        results = vercel_api.semantic_keyword_search("privacy fundamental right article")
+        scores = [score for _, score in results]
+
+        assert all(0.0 < s <= 1.0 for s in scores)
+        assert scores == sorted(scores, reverse=True)
+
+    def test_unknown_terms_return_nothing(self, vercel_api):
+        """Test that out-of-vocabulary or too-short queries return no results."""
+        assert vercel_api.semantic_keyword_search("zzzzqq") == []
+        assert vercel_api.semantic_keyword_search("a b") == []
+
+    def test_top_k(self, vercel_api):
+        """Test that top_k limits the number of results."""
+        results = vercel_api.semantic_keyword_search("supreme court india", top_k=2)
+
+        assert len(results) <= 2
+        assert vercel_api.semantic_keyword_search("supreme court india", top_k=0) == []
+        assert vercel_api.semantic_keyword_search("supreme court india", top_k=-1) == []
+
+    def test_word_order_shares_cache_entry(self, vercel_api):
+        """Test that reordered queries hit the same memoized ranking."""
+        vercel_api._rank_documents.cache_clear()
+
+        first = vercel_api.semantic_keyword_search("basic structure doctrine")
+        second = vercel_api.semantic_keyword_search("doctrine structure basic")
+
+        assert first == second
+        assert vercel_api._rank_documents.cache_info().hits == 1
+
+    def test_repeated_words_score_once(self, vercel_api):
+        """Test that duplicate query words do not change the ranking."""
+        once = vercel_api.semantic_keyword_search("privacy article")
+        repeated = vercel_api.semantic_keyword_search("privacy privacy privacy article")
+
+        assert once == repeated
+
+
+class TestLLMResponseCache:
+    """Tests for the LRU cache in front of call_groq_llm."""
+
+    def test_repeat_query_skips_llm(self, vercel_api, monkeypatch):
+        """Test that identical inputs only reach the LLM once."""
+        calls = []
+
+        def fake_llm(query, context, statute_info=""):
+            calls.append(query)
+            return f"answer for {query}"
+
+        monkeypatch.setattr(vercel_api, "call_groq_llm", fake_llm)
+        vercel_api._llm_cache.clear()
+
+        first = vercel_api.generate_llm_response("bail", "ctx")
+        second = vercel_api.generate_llm_response("bail", "ctx")
+
+        assert first == second == "answer for bail"
+        assert calls == ["bail"]
+
+    def test_errors_are_not_cached(self, vercel_api, monkeypatch):
+        """Test that error strings are retried on the next request."""
+        calls = []
+
+        def failing_llm(query, context, statute_info=""):
+            calls.append(query)
+            return "AI service error: 503"
+
+        monkeypatch.setattr(vercel_api, "call_groq_llm", failing_llm)
+        vercel_api._llm_cache.clear()
+
+        vercel_api.generate_llm_response("bail", "ctx")
+        vercel_api.generate_llm_response("bail", "ctx")
+
+        assert len(calls) == 2
+
+
+class TestTokens:
+    """Tests for HMAC-signed demo tokens."""
+
+    def test_round_trip(self, vercel_api):
+        """Test that a freshly issued token verifies."""
+        token = vercel_api.create_token("student_demo", "student")
+
+        assert vercel_api.verify_token(token) == {"username": "student_demo", "role": "student"}
+
+    def test_tampered_token_rejected(self, vercel_api):
+        """Test that changing the role invalidates the signature."""
+        token = vercel_api.create_token("student_demo", "student")
+
+        assert vercel_api.verify_token(token.replace(":student:", ":admin:")) is None
+        assert vercel_api.verify_token("student_demo:student:123") is None